@@ -0,0 +1,99 @@
+"""Compare the delimiter based listing of ``AzureStorageBlobsAdapter.list`` with a
+flat scan of every blob below the listed path, on a deep synthetic tree in Azurite.
+
+Run it inside the development container:
+
+    uv run python -m benchmarks.azure_list
+"""
+
+import asyncio
+import os
+import time
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import ContainerClient
+
+from plugfs.azure import AzureStorageBlobsAdapter
+
+DEPTH = 4
+FANOUT = 4
+FILES_PER_DIRECTORY = 8
+UPLOAD_CONCURRENCY = 32
+ROUNDS = 5
+
+
+def _blob_names(prefix: str = "", depth: int = DEPTH) -> list[str]:
+    names = [f"{prefix}file_{index}.bin" for index in range(FILES_PER_DIRECTORY)]
+    if depth > 0:
+        for index in range(FANOUT):
+            names += _blob_names(f"{prefix}directory_{index}/", depth - 1)
+
+    return names
+
+
+async def _populate(client: ContainerClient, names: list[str]) -> None:
+    try:
+        await client.delete_container()
+    except ResourceNotFoundError:
+        """No need to delete the container if it does not exist."""
+
+    await client.create_container()
+
+    semaphore = asyncio.Semaphore(UPLOAD_CONCURRENCY)
+
+    async def upload(name: str) -> None:
+        async with semaphore:
+            await client.upload_blob(name, b"x")
+
+    await asyncio.gather(*(upload(name) for name in names))
+
+
+async def _flat_scan(client: ContainerClient, path: str) -> int:
+    """The listing strategy used before delimiter listing: page through every blob
+    below the path and fold nested names into their top level directory."""
+    entries: set[str] = set()
+    async for blob in client.list_blobs(name_starts_with=path):
+        entries.add(blob.name.removeprefix(path).split("/")[0])
+
+    return len(entries)
+
+
+async def main() -> None:
+    client = ContainerClient.from_connection_string(
+        f"DefaultEndpointsProtocol=http;AccountName={os.getenv("AZURE_ACCOUNT_NAME")};"
+        f"AccountKey={os.getenv("AZURE_ACCOUNT_KEY")};"
+        f"BlobEndpoint={os.getenv("AZURE_STORAGE_URL")}/{os.getenv("AZURE_ACCOUNT_NAME")};",
+        os.getenv("AZURE_CONTAINER", "default_container_name") + "-benchmark",
+    )
+
+    async with client:
+        names = _blob_names()
+        await _populate(client, names)
+        adapter = AzureStorageBlobsAdapter(client)
+
+        print(f"Synthetic tree: {len(names)} blobs, depth {DEPTH}, fan-out {FANOUT}")
+
+        for path in ["", "directory_0/", "directory_0/directory_0/"]:
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                items = await adapter.list(path)
+            delimiter_duration = (time.perf_counter() - start) / ROUNDS
+
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                count = await _flat_scan(client, path)
+            flat_duration = (time.perf_counter() - start) / ROUNDS
+
+            assert count == len(items)
+            print(
+                f"list({path!r}): {len(items)} items, "
+                f"delimiter {delimiter_duration * 1000:.1f} ms, "
+                f"flat scan {flat_duration * 1000:.1f} ms "
+                f"({flat_duration / delimiter_duration:.1f}x)"
+            )
+
+        await client.delete_container()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Compare reading a large blob with a single download stream to reading it in ranges
+that are downloaded in parallel into one buffer, against Azurite.
+
+    uv run python -m benchmarks.azure_read
+"""
+
+import asyncio
+import os
+import time
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import ContainerClient
+
+from plugfs.azure import AzureStorageBlobsAdapter
+
+BLOB_SIZE = 256 * 1024 * 1024
+CONFIGURATIONS = [(1, 4 * 1024 * 1024), (4, 4 * 1024 * 1024), (8, 8 * 1024 * 1024)]
+ROUNDS = 3
+
+
+async def _single_stream(client: ContainerClient, name: str) -> int:
+    """The read path used before ranged downloads."""
+    async with client.get_blob_client(name) as blob_client:
+        stream = await blob_client.download_blob()
+        return len(await stream.readall())
+
+
+async def main() -> None:
+    client = ContainerClient.from_connection_string(
+        f"DefaultEndpointsProtocol=http;AccountName={os.getenv("AZURE_ACCOUNT_NAME")};"
+        f"AccountKey={os.getenv("AZURE_ACCOUNT_KEY")};"
+        f"BlobEndpoint={os.getenv("AZURE_STORAGE_URL")}/{os.getenv("AZURE_ACCOUNT_NAME")};",
+        os.getenv("AZURE_CONTAINER", "default_container_name") + "-benchmark",
+    )
+
+    async with client:
+        try:
+            await client.delete_container()
+        except ResourceNotFoundError:
+            """No need to delete the container if it does not exist."""
+
+        await client.create_container()
+        await client.upload_blob("large.bin", os.urandom(BLOB_SIZE), max_concurrency=8)
+
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            await _single_stream(client, "large.bin")
+        duration = (time.perf_counter() - start) / ROUNDS
+        print(
+            f"single stream: {duration:.2f} s, "
+            f"{BLOB_SIZE / duration / 1024 / 1024:.0f} MiB/s"
+        )
+
+        for max_concurrency, chunk_size in CONFIGURATIONS:
+            adapter = AzureStorageBlobsAdapter(
+                client, max_concurrency=max_concurrency, chunk_size=chunk_size
+            )
+
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                data = await adapter.read("large.bin")
+            duration = (time.perf_counter() - start) / ROUNDS
+
+            assert len(data) == BLOB_SIZE
+            print(
+                f"max_concurrency={max_concurrency}, "
+                f"chunk_size={chunk_size // 1024 // 1024} MiB: {duration:.2f} s, "
+                f"{BLOB_SIZE / duration / 1024 / 1024:.0f} MiB/s"
+            )
+
+        await client.delete_container()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,86 @@
+"""Measure small object operations per second against Azurite, with the default transport
+and with pooled transports of several sizes. The adapter uses the transport of the container
+client for all of its blob operations.
+
+    uv run python -m benchmarks.azure_small_ops
+"""
+
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import ContainerClient
+
+from plugfs.azure import AzureStorageBlobsAdapter, PooledTransport
+
+OBJECTS = 200
+OBJECT_SIZE = 1024
+CONCURRENCY = 64
+POOL_SIZES = [None, 16, 64, 128]
+
+
+def _client(pool_size: int | None) -> ContainerClient:
+    connection_string = (
+        f"DefaultEndpointsProtocol=http;AccountName={os.getenv("AZURE_ACCOUNT_NAME")};"
+        f"AccountKey={os.getenv("AZURE_ACCOUNT_KEY")};"
+        f"BlobEndpoint={os.getenv("AZURE_STORAGE_URL")}/{os.getenv("AZURE_ACCOUNT_NAME")};"
+    )
+    container = os.getenv("AZURE_CONTAINER", "default_container_name") + "-benchmark"
+    if pool_size is None:
+        return ContainerClient.from_connection_string(connection_string, container)
+
+    return ContainerClient.from_connection_string(
+        connection_string, container, transport=PooledTransport(pool_size=pool_size)
+    )
+
+
+async def _operations_per_second(
+    operation: Callable[[str], Awaitable[object]],
+) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def run(name: str) -> None:
+        async with semaphore:
+            await operation(name)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(f"small/{index}") for index in range(OBJECTS)))
+
+    return OBJECTS / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    data = os.urandom(OBJECT_SIZE)
+
+    for pool_size in POOL_SIZES:
+        async with _client(pool_size) as client:
+            try:
+                await client.delete_container()
+            except ResourceNotFoundError:
+                """No need to delete the container if it does not exist."""
+
+            await client.create_container()
+            adapter = AzureStorageBlobsAdapter(client)
+
+            async def write(name: str) -> object:
+                return await adapter.write(name, data)
+
+            results = {
+                "write": await _operations_per_second(write),
+                "read": await _operations_per_second(adapter.read),
+                "get_metadata": await _operations_per_second(adapter.get_metadata),
+                "get_file": await _operations_per_second(adapter.get_file),
+            }
+
+            print(
+                f"pool size {pool_size or 'default'}: "
+                + ", ".join(f"{name} {rate:.0f}/s" for name, rate in results.items())
+            )
+
+            await client.delete_container()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+"""Compare ``LocalAdapter.list``, which reads a directory with a single ``os.scandir`` call
+in one worker thread, with the previous ``listdir`` plus ``isdir`` per entry approach.
+
+    uv run python -m benchmarks.local_list
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+
+from aiofiles.os import listdir
+from aiofiles.ospath import isdir
+
+from plugfs.local import LocalAdapter
+
+SIZES = [1_000, 10_000, 100_000]
+DIRECTORY_RATIO = 10
+ROUNDS = 3
+
+
+def _populate(path: str, size: int) -> None:
+    for index in range(size):
+        if index % DIRECTORY_RATIO == 0:
+            os.mkdir(os.path.join(path, f"directory_{index}"))
+        else:
+            with open(os.path.join(path, f"file_{index}.bin"), "wb"):
+                pass
+
+
+async def _listdir_isdir(path: str) -> int:
+    """One executor dispatch to list the names and another one per entry."""
+    count = 0
+    for item in await listdir(path):
+        await isdir(f"{path}/{item}")
+        count += 1
+
+    return count
+
+
+async def main() -> None:
+    adapter = LocalAdapter()
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as path:
+            _populate(path, size)
+
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                items = await adapter.list(path)
+            scandir_duration = (time.perf_counter() - start) / ROUNDS
+
+            start = time.perf_counter()
+            for _ in range(ROUNDS):
+                count = await _listdir_isdir(path)
+            listdir_duration = (time.perf_counter() - start) / ROUNDS
+
+            assert count == len(items)
+            print(
+                f"{size} entries: scandir {scandir_duration * 1000:.1f} ms, "
+                f"listdir + isdir {listdir_duration * 1000:.1f} ms "
+                f"({listdir_duration / scandir_duration:.1f}x)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,102 @@
+"""Compare the peak memory use and duration of reading a large local file with ``read``,
+``get_iterator``, ``get_view_iterator`` and ``open_mmap``. Every read runs in a fresh
+process, so the peak resident set size of each read is measured on its own. Pages of a
+memory map count as resident, but they belong to the page cache and are not copied, so the
+peak of the memory allocated by Python is shown as well.
+
+    uv run python -m benchmarks.local_read_memory
+"""
+
+import asyncio
+import hashlib
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Any
+
+from plugfs.local import LocalAdapter
+
+FILE_SIZE = 1024 * 1024 * 1024
+
+
+async def _read(path: str) -> bytes:
+    return hashlib.sha256(await LocalAdapter().read(path)).digest()
+
+
+async def _get_iterator(path: str) -> bytes:
+    digest = hashlib.sha256()
+    async for chunk in await LocalAdapter().get_iterator(path):
+        digest.update(chunk)
+
+    return digest.digest()
+
+
+async def _get_view_iterator(path: str) -> bytes:
+    digest = hashlib.sha256()
+    async for view in await LocalAdapter().get_view_iterator(path):
+        digest.update(view)
+
+    return digest.digest()
+
+
+async def _open_mmap(path: str) -> bytes:
+    async with LocalAdapter().open_mmap(path) as view:
+        return hashlib.sha256(view).digest()
+
+
+READS: dict[str, Callable[[str], Coroutine[Any, Any, bytes]]] = {
+    "read": _read,
+    "get_iterator": _get_iterator,
+    "get_view_iterator": _get_view_iterator,
+    "open_mmap": _open_mmap,
+}
+
+
+def _measure(name: str, path: str) -> tuple[bytes, float, int, int]:
+    start = time.perf_counter()
+    digest = asyncio.run(READS[name](path))
+    duration = time.perf_counter() - start
+
+    # Tracing slows down the read, so it is measured in a second read.
+    tracemalloc.start()
+    asyncio.run(READS[name](path))
+    _, allocated = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Kilobytes on Linux.
+    resident = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    return digest, duration, resident, allocated
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "large.bin")
+        with open(path, "wb") as file:
+            for _ in range(FILE_SIZE // (64 * 1024 * 1024)):
+                file.write(os.urandom(64 * 1024 * 1024))
+
+        loop = asyncio.get_running_loop()
+        digests = set()
+        for name in READS:
+            with ProcessPoolExecutor(1, mp_context=get_context("spawn")) as executor:
+                measurement = loop.run_in_executor(executor, _measure, name, path)
+                digest, duration, resident, allocated = await measurement
+
+            digests.add(digest)
+            print(
+                f"{name}: {duration * 1000:.0f} ms, "
+                f"peak resident {resident / 1024 / 1024:.0f} MiB, "
+                f"peak allocated {allocated / 1024 / 1024:.1f} MiB"
+            )
+
+        assert len(digests) == 1
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""Compare small file operations per second of ``LocalAdapter``, which runs each operation
+as a single executor call, with the previous aiofiles calls that needed several executor
+dispatches per operation, and with a dedicated thread pool.
+
+    uv run python -m benchmarks.local_small_ops
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+import aiofiles
+from aiofiles.ospath import exists, isfile
+
+from plugfs.local import LocalAdapter
+
+FILES = 2_000
+FILE_SIZE = 4 * 1024
+CONCURRENCY = 64
+POOL_SIZE = 32
+
+
+async def _previous_get_file_read(path: str) -> bytes:
+    """The executor dispatches of get_file and read before they were combined."""
+    if not await exists(path) or not await isfile(path):
+        raise FileNotFoundError(path)
+
+    async with aiofiles.open(path, mode="rb") as file:
+        return await file.read()
+
+
+async def _previous_write(path: str) -> None:
+    async with aiofiles.open(path, mode="wb") as file:
+        await file.write(b"x" * FILE_SIZE)
+
+
+async def _measure(
+    paths: list[str], operation: Callable[[str], Awaitable[object]]
+) -> float:
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def run(path: str) -> None:
+        async with semaphore:
+            await operation(path)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(path) for path in paths))
+
+    return len(paths) / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = [os.path.join(directory, f"file_{index}") for index in range(FILES)]
+        for path in paths:
+            with open(path, "wb") as file:
+                file.write(os.urandom(FILE_SIZE))
+
+        with ThreadPoolExecutor(POOL_SIZE) as executor:
+            adapters = {
+                "default executor": LocalAdapter(),
+                f"pool of {POOL_SIZE} threads": LocalAdapter(executor=executor),
+            }
+
+            async def get_file_read(adapter: LocalAdapter, path: str) -> bytes:
+                file = await adapter.get_file(path)
+                return await file.read()
+
+            async def write(adapter: LocalAdapter, path: str) -> None:
+                await adapter.write(path, b"x" * FILE_SIZE)
+
+            previous = await _measure(paths, _previous_get_file_read)
+            print(f"get_file + read, previous: {previous:.0f} ops/s")
+            for name, adapter in adapters.items():
+                rate = await _measure(paths, partial(get_file_read, adapter))
+                print(
+                    f"get_file + read, {name}: {rate:.0f} ops/s ({rate / previous:.1f}x)"
+                )
+
+            previous = await _measure(paths, _previous_write)
+            print(f"write, previous: {previous:.0f} ops/s")
+            for name, adapter in adapters.items():
+                rate = await _measure(paths, partial(write, adapter))
+                print(f"write, {name}: {rate:.0f} ops/s ({rate / previous:.1f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
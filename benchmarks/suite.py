@@ -0,0 +1,421 @@
+"""Benchmark suite for the adapters, with results in JSON to compare releases. Covers
+listing wide and deep trees, small file operations per second, sequential read and write
+throughput, streaming iterators and the scaling of concurrent reads. The Azure adapter is
+benchmarked against the Azurite service of compose.yaml.
+
+    uv run python -m benchmarks.suite --adapter local --output results.json
+    uv run python -m benchmarks.suite --quick
+
+The data is generated from a fixed seed and every measurement reports the median of its
+rounds next to the individual samples.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any
+
+from azure.core.exceptions import ResourceNotFoundError
+from azure.storage.blob.aio import ContainerClient
+
+from plugfs.azure import AzureStorageBlobsAdapter
+from plugfs.filesystem import Adapter
+from plugfs.local import LocalAdapter
+
+SEED = 42
+MEBIBYTE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class Scale:
+    rounds: int
+    wide_entries: int
+    deep_levels: int
+    deep_fanout: int
+    small_files: int
+    small_file_size: int
+    large_file_size: int
+    concurrencies: tuple[int, ...]
+
+
+FULL = Scale(
+    rounds=5,
+    wide_entries=10_000,
+    deep_levels=5,
+    deep_fanout=6,
+    small_files=1_000,
+    small_file_size=4 * 1024,
+    large_file_size=256 * MEBIBYTE,
+    concurrencies=(1, 4, 16, 64),
+)
+QUICK = Scale(
+    rounds=3,
+    wide_entries=1_000,
+    deep_levels=3,
+    deep_fanout=4,
+    small_files=200,
+    small_file_size=4 * 1024,
+    large_file_size=32 * MEBIBYTE,
+    concurrencies=(1, 16),
+)
+
+
+@dataclass(frozen=True)
+class Result:
+    adapter: str
+    benchmark: str
+    parameters: dict[str, Any]
+    unit: str
+    median: float
+    samples: list[float]
+
+
+async def _time(operation: Callable[[], Awaitable[object]]) -> float:
+    start = time.perf_counter()
+    await operation()
+
+    return time.perf_counter() - start
+
+
+async def _gather(
+    count: int, concurrency: int, operation: Callable[[int], Awaitable[object]]
+) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(index: int) -> None:
+        async with semaphore:
+            await operation(index)
+
+    await asyncio.gather(*(run(index) for index in range(count)))
+
+
+class Suite:
+    _name: str
+    _adapter: Adapter
+    _root: str
+    _scale: Scale
+    _random: random.Random
+    results: list[Result]
+
+    def __init__(self, name: str, adapter: Adapter, root: str, scale: Scale) -> None:
+        self._name = name
+        self._adapter = adapter
+        self._root = root
+        self._scale = scale
+        self._random = random.Random(SEED)
+        self.results = []
+
+    def _record(
+        self,
+        benchmark: str,
+        parameters: dict[str, Any],
+        unit: str,
+        samples: list[float],
+    ) -> None:
+        result = Result(
+            self._name,
+            benchmark,
+            parameters,
+            unit,
+            statistics.median(samples),
+            samples,
+        )
+        self.results.append(result)
+        print(
+            f"{self._name} {benchmark} {parameters}: {result.median:.2f} {unit}",
+            file=sys.stderr,
+        )
+
+    async def _measure(
+        self, operation: Callable[[], Awaitable[object]], amount: float
+    ) -> list[float]:
+        """The amount per second of every round."""
+        samples = []
+        for _ in range(self._scale.rounds):
+            duration = await _time(operation)
+            samples.append(amount / duration)
+
+        return samples
+
+    async def run(self) -> None:
+        await self.list_wide()
+        await self.walk_deep()
+        await self.small_operations()
+        await self.sequential()
+        await self.streaming()
+        await self.concurrency_scaling()
+
+    async def list_wide(self) -> None:
+        directory = f"{self._root}/wide"
+        await self._adapter.makedirs(directory)
+        await _gather(
+            self._scale.wide_entries,
+            64,
+            lambda index: self._adapter.write(f"{directory}/file_{index}", b""),
+        )
+
+        samples = await self._measure(
+            lambda: self._adapter.list(directory), self._scale.wide_entries
+        )
+        self._record(
+            "list_wide", {"entries": self._scale.wide_entries}, "entries/s", samples
+        )
+
+        async def iterate() -> None:
+            async for _ in await self._adapter.iter_list(directory):
+                pass
+
+        samples = await self._measure(iterate, self._scale.wide_entries)
+        self._record(
+            "iter_list_wide",
+            {"entries": self._scale.wide_entries},
+            "entries/s",
+            samples,
+        )
+
+    async def walk_deep(self) -> None:
+        directories = [f"{self._root}/deep"]
+        files: list[str] = []
+        for _ in range(self._scale.deep_levels):
+            level: list[str] = []
+            for directory in directories:
+                await self._adapter.makedirs(directory)
+                files.append(f"{directory}/file")
+                level.extend(
+                    f"{directory}/directory_{index}"
+                    for index in range(self._scale.deep_fanout)
+                )
+            directories = level
+        await _gather(
+            len(files), 64, lambda index: self._adapter.write(files[index], b"")
+        )
+
+        async def walk() -> None:
+            async for _ in await self._adapter.walk(f"{self._root}/deep"):
+                pass
+
+        samples = await self._measure(walk, len(files))
+        self._record(
+            "walk_deep",
+            {
+                "levels": self._scale.deep_levels,
+                "fanout": self._scale.deep_fanout,
+                "files": len(files),
+            },
+            "files/s",
+            samples,
+        )
+
+    async def small_operations(self) -> None:
+        directory = f"{self._root}/small"
+        await self._adapter.makedirs(directory)
+        count = self._scale.small_files
+        data = self._random.randbytes(self._scale.small_file_size)
+        parameters = {
+            "files": count,
+            "size": self._scale.small_file_size,
+            "concurrency": 64,
+        }
+
+        async def write() -> None:
+            await _gather(
+                count,
+                64,
+                lambda index: self._adapter.write(f"{directory}/{index}", data),
+            )
+
+        async def get_file() -> None:
+            await _gather(
+                count, 64, lambda index: self._adapter.get_file(f"{directory}/{index}")
+            )
+
+        async def read() -> None:
+            await _gather(
+                count, 64, lambda index: self._adapter.read(f"{directory}/{index}")
+            )
+
+        async def delete() -> None:
+            await _gather(
+                count, 64, lambda index: self._adapter.delete(f"{directory}/{index}")
+            )
+
+        samples = await self._measure(write, count)
+        self._record("small_write", parameters, "ops/s", samples)
+
+        for name, operation in [("small_get_file", get_file), ("small_read", read)]:
+            samples = await self._measure(operation, count)
+            self._record(name, parameters, "ops/s", samples)
+
+        samples = []
+        for _ in range(self._scale.rounds):
+            samples.append(count / await _time(delete))
+            await write()
+        self._record("small_delete", parameters, "ops/s", samples)
+
+    async def sequential(self) -> None:
+        path = f"{self._root}/large.bin"
+        size = self._scale.large_file_size
+        data = self._random.randbytes(size)
+        parameters = {"size": size}
+
+        samples = await self._measure(
+            lambda: self._adapter.write(path, data), size / MEBIBYTE
+        )
+        self._record("sequential_write", parameters, "MiB/s", samples)
+
+        samples = await self._measure(lambda: self._adapter.read(path), size / MEBIBYTE)
+        self._record("sequential_read", parameters, "MiB/s", samples)
+
+    async def streaming(self) -> None:
+        path = f"{self._root}/streamed.bin"
+        size = self._scale.large_file_size
+        chunk_size = 4 * MEBIBYTE
+        data = self._random.randbytes(size)
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for offset in range(0, size, chunk_size):
+                yield data[offset : offset + chunk_size]
+
+        samples = await self._measure(
+            lambda: self._adapter.write_iterator(path, chunks()), size / MEBIBYTE
+        )
+        self._record(
+            "write_iterator",
+            {"size": size, "chunk_size": chunk_size},
+            "MiB/s",
+            samples,
+        )
+
+        for read_ahead in [0, 2]:
+
+            async def iterate() -> None:
+                iterator = await self._adapter.get_iterator(
+                    path, chunk_size, read_ahead
+                )
+                async for _ in iterator:
+                    pass
+
+            samples = await self._measure(iterate, size / MEBIBYTE)
+            self._record(
+                "get_iterator",
+                {"size": size, "chunk_size": chunk_size, "read_ahead": read_ahead},
+                "MiB/s",
+                samples,
+            )
+
+    async def concurrency_scaling(self) -> None:
+        directory = f"{self._root}/small"
+        count = self._scale.small_files
+
+        for concurrency in self._scale.concurrencies:
+            samples = await self._measure(
+                lambda: _gather(
+                    count,
+                    concurrency,
+                    lambda index: self._adapter.read(f"{directory}/{index}"),
+                ),
+                count,
+            )
+            self._record(
+                "concurrent_read",
+                {
+                    "files": count,
+                    "size": self._scale.small_file_size,
+                    "concurrency": concurrency,
+                },
+                "ops/s",
+                samples,
+            )
+
+
+@asynccontextmanager
+async def _local() -> AsyncIterator[tuple[Adapter, str]]:
+    with tempfile.TemporaryDirectory() as directory:
+        yield LocalAdapter(), directory
+
+
+@asynccontextmanager
+async def _azure() -> AsyncIterator[tuple[Adapter, str]]:
+    client = ContainerClient.from_connection_string(
+        f"DefaultEndpointsProtocol=http;AccountName={os.getenv("AZURE_ACCOUNT_NAME")};"
+        f"AccountKey={os.getenv("AZURE_ACCOUNT_KEY")};"
+        f"BlobEndpoint={os.getenv("AZURE_STORAGE_URL")}/{os.getenv("AZURE_ACCOUNT_NAME")};",
+        os.getenv("AZURE_CONTAINER", "default_container_name") + "-benchmark",
+    )
+
+    async with client:
+        try:
+            await client.delete_container()
+        except ResourceNotFoundError:
+            """No need to delete the container if it does not exist."""
+
+        await client.create_container()
+        try:
+            yield AzureStorageBlobsAdapter(client, max_concurrency=4), "/suite"
+        finally:
+            await client.delete_container()
+
+
+ADAPTERS = {"local": _local, "azure": _azure}
+
+
+def _package_version() -> str:
+    try:
+        return version("plugfs")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--adapter", choices=[*ADAPTERS, "all"], default="all", help="default: all"
+    )
+    parser.add_argument(
+        "--output", help="file to write the results to, default: standard output"
+    )
+    parser.add_argument(
+        "--quick", action="store_true", help="smaller data and fewer rounds"
+    )
+    arguments = parser.parse_args()
+
+    started = datetime.now(timezone.utc)
+    scale = QUICK if arguments.quick else FULL
+    names = list(ADAPTERS) if arguments.adapter == "all" else [arguments.adapter]
+    results: list[Result] = []
+    for name in names:
+        async with ADAPTERS[name]() as (adapter, root):
+            suite = Suite(name, adapter, root, scale)
+            await suite.run()
+            results.extend(suite.results)
+
+    report = {
+        "plugfs": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "started": started.isoformat(),
+        "scale": asdict(scale),
+        "results": [asdict(result) for result in results],
+    }
+    output = json.dumps(report, indent=2)
+    if arguments.output is None:
+        print(output)
+    else:
+        with open(arguments.output, "w") as file:
+            file.write(output)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,36 +1,141 @@
+import asyncio
+import io
 import os
-from typing import AsyncIterator, final
-
-from azure.core.exceptions import ResourceNotFoundError
-from azure.storage.blob.aio import ContainerClient
+from collections import deque
+from collections.abc import Sequence
+from itertools import islice
+from typing import Any, AsyncIterator, final
+
+import aiohttp
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob import BlobBlock, BlobProperties
+from azure.storage.blob.aio import BlobPrefix, ContainerClient
 
 from plugfs.filesystem import (
     Adapter,
     Directory,
     DirectoryListing,
     File,
+    FileMetadata,
     NotFoundException,
+    _check_chunks,
+    _check_range,
     _FilesystemItem,
 )
 
 
+def _to_metadata(properties: BlobProperties) -> FileMetadata:
+    return FileMetadata(
+        size=properties.size,
+        last_modified=properties.last_modified,
+        etag=properties.etag,
+        content_type=properties.content_settings.content_type,
+    )
+
+
+_BATCH_SIZE = 256
+# The size of the first request of a download, like the default max single get size of the
+# SDK, smaller blobs are downloaded in a single request.
+_SINGLE_GET_SIZE = 32 * 1024 * 1024
+
+
+async def _zip[T, U](
+    items: Sequence[T], iterator: AsyncIterator[U]
+) -> AsyncIterator[tuple[T, U]]:
+    index = 0
+    async for item in iterator:
+        yield items[index], item
+        index += 1
+
+
+async def _split_blocks(
+    iterator: AsyncIterator[bytes], block_size: int
+) -> AsyncIterator[bytes]:
+    buffer = bytearray()
+    async for chunk in iterator:
+        buffer += chunk
+        while len(buffer) >= block_size:
+            yield bytes(buffer[:block_size])
+            del buffer[:block_size]
+
+    if buffer:
+        yield bytes(buffer)
+
+
+async def _prepend(
+    first: bytes, iterator: AsyncIterator[bytes]
+) -> AsyncIterator[bytes]:
+    yield first
+    async for item in iterator:
+        yield item
+
+
+@final
+class PooledTransport(AioHttpTransport):  # type: ignore[misc]
+    """An aiohttp transport that keeps up to pool size connections alive. The blob clients
+    of a container client share its transport, pass this transport to the container client
+    to size the connection pool used by all operations of the adapter."""
+
+    session: aiohttp.ClientSession | None
+    _pool_size: int
+    _trust_env: bool
+
+    def __init__(self, pool_size: int = 100, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._pool_size = pool_size
+        self._trust_env = kwargs.get("use_env_settings", True)
+
+    async def open(self) -> None:
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self._pool_size),
+                trust_env=self._trust_env,
+                cookie_jar=aiohttp.DummyCookieJar(),
+                auto_decompress=False,
+            )
+
+        await super().open()
+
+
 @final
 class AzureFile(File):
     _adapter: "AzureStorageBlobsAdapter"
-
-    def __init__(self, path: str, adapter: "AzureStorageBlobsAdapter"):
-        super().__init__(path)
+    _properties: BlobProperties | None
+
+    def __init__(
+        self,
+        path: str,
+        adapter: "AzureStorageBlobsAdapter",
+        properties: BlobProperties | None = None,
+    ):
+        super().__init__(path, None if properties is None else _to_metadata(properties))
         self._adapter = adapter
+        self._properties = properties
 
     @property
-    async def size(self) -> int:
-        return await self._adapter.get_size(self._path)
+    async def properties(self) -> BlobProperties:
+        """The properties are taken from the listing or lookup that produced this file,
+        they are only requested from the service when they were not provided."""
+        if self._properties is None:
+            self._properties = await self._adapter.get_properties(self._path)
+
+        return self._properties
+
+    async def _load_metadata(self) -> FileMetadata:
+        return _to_metadata(await self.properties)
 
     async def read(self) -> bytes:
         return await self._adapter.read(self._path)
 
-    async def get_iterator(self) -> AsyncIterator[bytes]:
-        return await self._adapter.get_iterator(self._path)
+    async def read_range(self, offset: int, length: int | None = None) -> bytes:
+        return await self._adapter.read_range(self._path, offset, length)
+
+    async def get_iterator(
+        self, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(self._path, chunk_size, read_ahead)
 
     async def delete(self) -> None:
         await self._adapter.delete(self._path)
@@ -39,79 +144,267 @@ class AzureFile(File):
 @final
 class AzureStorageBlobsAdapter(Adapter):
     _client: ContainerClient
-
-    def __init__(self, client: ContainerClient):
+    _max_concurrency: int
+    _chunk_size: int
+    _block_size: int
+
+    def __init__(
+        self,
+        client: ContainerClient,
+        max_concurrency: int = 1,
+        chunk_size: int = 4 * 1024 * 1024,
+        block_size: int = 4 * 1024 * 1024,
+    ):
+        """Reads of blobs up to 32 MiB, or the chunk size when that is larger, take a single
+        request, the rest of larger blobs is downloaded in ranges of the chunk size. Streamed
+        uploads are staged in blocks of the block size. The max concurrency
+        determines how many of those ranges or blocks are transferred in parallel.
+        """
         self._client = client
+        self._max_concurrency = max_concurrency
+        self._chunk_size = chunk_size
+        self._block_size = block_size
 
     async def list(self, path: str) -> DirectoryListing:
+        return [item async for item in await self.iter_list(path)]
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
         if not path == "" and not path.endswith("/"):
             path += "/"
 
-        items: list[_FilesystemItem] = []
-        seen_directories: set[str] = set()
+        pages = self._client.walk_blobs(name_starts_with=path, delimiter="/").by_page()
+
+        async def iterate() -> AsyncIterator[_FilesystemItem]:
+            async for page in pages:
+                entries: list[tuple[str, _FilesystemItem]] = []
+
+                async for entry in page:
+                    if isinstance(entry, BlobPrefix):
+                        directory_name = entry.name.removeprefix(path).rstrip("/")
+                        if directory_name:
+                            entries.append(
+                                (entry.name, Directory(f"{path}{directory_name}"))
+                            )
+                    else:
+                        entries.append((entry.name, AzureFile(entry.name, self, entry)))
+
+                # The service returns the directory prefixes of a page ahead of its
+                # blobs, restore the lexicographic order of the container.
+                entries.sort(key=lambda entry: entry[0])
 
-        async for blob in self._client.list_blobs(name_starts_with=path):
-            relative_path = blob.name.removeprefix(path)
+                for _, item in entries:
+                    yield item
+
+        return iterate()
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        """A single flat listing of every blob whose name starts with the prefix."""
+        if not path == "" and not path.endswith("/"):
+            path += "/"
 
-            if "/" not in relative_path:
-                items.append(AzureFile(blob.name, self))
-            else:
-                directory_name = relative_path.split("/")[0]
-                if directory_name and directory_name not in seen_directories:
-                    seen_directories.add(directory_name)
-                    items.append(Directory(f"{path}{directory_name}"))
+        blobs = self._client.list_blobs(name_starts_with=f"{path}{name_prefix}")
 
-        return items
+        async def iterate() -> AsyncIterator[File]:
+            async for blob in blobs:
+                yield AzureFile(blob.name, self, blob)
+
+        return iterate()
 
     async def read(self, path: str) -> bytes:
+        return await self._download(path)
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        _check_range(offset, length)
+        if length == 0:
+            return b""
+
+        return await self._download(path, offset, length)
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        """Downloads the blob in ranges of the chunk size, with a read ahead that many ranges
+        are downloaded in parallel while the current chunk is being processed."""
+        _check_chunks(chunk_size, read_ahead)
+        size = chunk_size or self._chunk_size
         blob_client = self._client.get_blob_client(path)
 
-        async with blob_client:
+        first_chunk = b""
+        blob_size = 0
+        etag = None
+        try:
+            stream = await blob_client.download_blob(offset=0, length=size)
+        except ResourceNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+        except HttpResponseError as error:
+            # An empty blob has no range to download.
+            if error.status_code != 416:
+                raise
+        else:
+            first_chunk = await stream.readall()
+            content_range = stream.properties.content_range
+            blob_size = (
+                int(content_range.rpartition("/")[2])
+                if content_range
+                else len(first_chunk)
+            )
+            etag = stream.properties.etag
+
+        starts = iter(range(len(first_chunk), blob_size, size))
+
+        async def download_chunk(start: int) -> bytes:
             try:
-                stream = await blob_client.download_blob()
+                chunk_stream = await blob_client.download_blob(
+                    offset=start,
+                    length=size,
+                    etag=etag,
+                    match_condition=MatchConditions.IfNotModified,
+                )
             except ResourceNotFoundError as error:
                 raise NotFoundException(f"Failed to find file '{path}'!") from error
 
-            return await stream.readall()
+            return await chunk_stream.readall()
 
-    async def get_iterator(self, path: str) -> AsyncIterator[bytes]:
-        blob_client = self._client.get_blob_client(path)
+        async def iterate() -> AsyncIterator[bytes]:
+            downloads: deque[asyncio.Task[bytes]] = deque()
+
+            def download_ahead(depth: int) -> None:
+                for start in islice(starts, max(depth - len(downloads), 0)):
+                    downloads.append(asyncio.create_task(download_chunk(start)))
 
-        async with blob_client:
             try:
-                stream = await blob_client.download_blob()
-            except ResourceNotFoundError as error:
-                raise NotFoundException(f"Failed to find file '{path}'!") from error
+                download_ahead(read_ahead)
+                if first_chunk:
+                    yield first_chunk
 
-            return stream.chunks()
+                while True:
+                    if not downloads:
+                        download_ahead(1)
+                    if not downloads:
+                        break
 
-    async def get_file(self, path: str) -> File:
-        blob_client = self._client.get_blob_client(path)
+                    chunk = await downloads.popleft()
+                    download_ahead(read_ahead)
+                    yield chunk
+            finally:
+                for download in downloads:
+                    download.cancel()
 
-        async with blob_client:
-            if await blob_client.exists():
-                return AzureFile(path, self)
+        return iterate()
 
-        raise NotFoundException(f"Failed to find file '{path}'!")
+    async def get_file(self, path: str) -> File:
+        return AzureFile(path, self, await self.get_properties(path))
 
     async def write(self, path: str, data: bytes) -> AzureFile:
-        return await self._write(path, data)
+        blob_client = self._client.get_blob_client(path)
+
+        await blob_client.upload_blob(
+            data, overwrite=True, max_concurrency=self._max_concurrency
+        )
+
+        return AzureFile(path, self)
 
     async def write_iterator(
         self, path: str, iterator: AsyncIterator[bytes]
     ) -> AzureFile:
-        return await self._write(path, iterator)
+        """Stages the data in blocks of the block size, at most max concurrency blocks are
+        uploaded at the same time. Data that fits in a single block is uploaded at once.
+        """
+        blocks = _split_blocks(iterator, self._block_size)
+        first_block = await anext(blocks, b"")
+        if len(first_block) < self._block_size:
+            return await self.write(path, first_block)
+
+        blob_client = self._client.get_blob_client(path)
+
+        async def stage_block(block_id: str, block: bytes) -> None:
+            await blob_client.stage_block(block_id, block)
+
+        block_ids: list[str] = []
+        tasks: set[asyncio.Task[None]] = set()
+        try:
+            async for block in _prepend(first_block, blocks):
+                if len(tasks) >= self._max_concurrency:
+                    done, tasks = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task.result()
+
+                # Block ids must have the same length for all blocks of a blob.
+                block_ids.append(f"{len(block_ids):010d}")
+                tasks.add(asyncio.create_task(stage_block(block_ids[-1], block)))
+
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        await blob_client.commit_block_list(
+            [BlobBlock(block_id) for block_id in block_ids]
+        )
+
+        return AzureFile(path, self)
 
     async def get_size(self, path: str) -> int:
+        return (await self.get_properties(path)).size
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return _to_metadata(await self.get_properties(path))
+
+    async def get_properties(self, path: str) -> BlobProperties:
         blob_client = self._client.get_blob_client(path)
 
-        async with blob_client:
+        try:
+            return await blob_client.get_blob_properties()
+        except ResourceNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+    async def copy(self, source: str, destination: str) -> AzureFile:
+        """The copy is done by the service, within a storage account it usually completes
+        right away. Otherwise the destination is polled until the copy has finished."""
+        source_client = self._client.get_blob_client(source)
+        destination_client = self._client.get_blob_client(destination)
+
+        try:
+            copy = await destination_client.start_copy_from_url(source_client.url)
+        except ResourceNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to copy file '{source}' to '{destination}', file does not exist!"
+            ) from error
+
+        status = str(copy["copy_status"])
+        interval = 0.1
+        while status == "pending":
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 2)
+            properties = await destination_client.get_blob_properties()
+            status = str(properties.copy.status)
+
+        if status != "success":
+            raise HttpResponseError(
+                f"Failed to copy file '{source}' to '{destination}', copy {status}!"
+            )
+
+        return AzureFile(destination, self)
+
+    async def move(self, source: str, destination: str) -> AzureFile:
+        """Blob storage can not rename blobs, the blob is copied and the source deleted."""
+        if source == destination:
+            # Deleting the source would delete the only copy.
             try:
-                stream = await blob_client.download_blob()
-            except ResourceNotFoundError as error:
-                raise NotFoundException(f"Failed to find file '{path}'!") from error
+                return AzureFile(source, self, await self.get_properties(source))
+            except NotFoundException as error:
+                raise NotFoundException(
+                    f"Failed to move file '{source}' to '{destination}', file does not exist!"
+                ) from error
+
+        file = await self.copy(source, destination)
+        await self.delete(source)
 
-        return stream.size
+        return file
 
     async def makedirs(self, path: str) -> None:
         """Azure storage does not really have directories, so we don't need to do anything here.
@@ -120,18 +413,115 @@ class AzureStorageBlobsAdapter(Adapter):
     async def delete(self, path: str) -> None:
         blob_client = self._client.get_blob_client(path)
 
-        async with blob_client:
-            try:
-                await blob_client.delete_blob()
-            except ResourceNotFoundError as error:
-                raise NotFoundException(
-                    f"Failed to delete file '{path}', file does not exist!"
-                ) from error
-
-    async def _write(self, path: str, data: bytes | AsyncIterator[bytes]) -> AzureFile:
+        try:
+            await blob_client.delete_blob()
+        except ResourceNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to delete file '{path}', file does not exist!"
+            ) from error
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        """Deletes the blobs with blob batch requests of up to 256 blobs each, at most max
+        concurrency batch requests are sent at the same time."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def delete_batch(batch: Sequence[str]) -> list[NotFoundException | None]:
+            async with semaphore:
+                responses = await self._client.delete_blobs(
+                    *batch, raise_on_any_failure=False
+                )
+                results: list[NotFoundException | None] = []
+                async for path, response in _zip(batch, responses):
+                    if response.status_code == 404:
+                        results.append(
+                            NotFoundException(
+                                f"Failed to delete file '{path}', file does not exist!"
+                            )
+                        )
+                    elif response.status_code >= 300:
+                        raise HttpResponseError(response=response)
+                    else:
+                        results.append(None)
+
+                return results
+
+        batches = await asyncio.gather(
+            *(
+                delete_batch(paths[start : start + _BATCH_SIZE])
+                for start in range(0, len(paths), _BATCH_SIZE)
+            )
+        )
+
+        return [result for batch in batches for result in batch]
+
+    async def _download(
+        self, path: str, offset: int = 0, length: int | None = None
+    ) -> bytes:
         blob_client = self._client.get_blob_client(path)
 
-        async with blob_client:
-            await blob_client.upload_blob(data, overwrite=True)
-
-        return AzureFile(path, self)
+        first_size = max(self._chunk_size, _SINGLE_GET_SIZE)
+        try:
+            stream = await blob_client.download_blob(
+                offset=offset,
+                length=first_size if length is None else min(length, first_size),
+            )
+        except ResourceNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+        except HttpResponseError as error:
+            # The service refuses ranges that start at or beyond the end of the blob.
+            if error.status_code == 416:
+                return b""
+
+            raise
+
+        first_chunk = await stream.readall()
+        # The content range of the first response tells the size of the whole blob.
+        content_range = stream.properties.content_range
+        blob_size = (
+            int(content_range.rpartition("/")[2])
+            if content_range
+            else offset + len(first_chunk)
+        )
+        end = blob_size if length is None else min(blob_size, offset + length)
+        if offset + len(first_chunk) >= end:
+            return first_chunk
+
+        # The buffer is allocated at its final size up front and its value is returned
+        # without copying it, so the blob is held in memory once.
+        buffer = io.BytesIO()
+        buffer.seek(end - offset - 1)
+        buffer.write(b"\0")
+        buffer.seek(0)
+        received = buffer.write(first_chunk)
+        del first_chunk
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def download_chunk(start: int) -> None:
+            async with semaphore:
+                try:
+                    chunk_stream = await blob_client.download_blob(
+                        offset=start,
+                        length=min(self._chunk_size, end - start),
+                        etag=stream.properties.etag,
+                        match_condition=MatchConditions.IfNotModified,
+                    )
+                except ResourceNotFoundError as error:
+                    raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+                chunk = await chunk_stream.readall()
+                buffer.seek(start - offset)
+                buffer.write(chunk)
+
+        tasks = [
+            asyncio.create_task(download_chunk(start))
+            for start in range(offset + received, end, self._chunk_size)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return buffer.getvalue()
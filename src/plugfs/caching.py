@@ -0,0 +1,612 @@
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import AsyncIterator, final
+from uuid import uuid4
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _check_chunks,
+    _check_range,
+)
+from plugfs.local import LocalAdapter
+from plugfs.wrapper import WrappedFile, WrappingAdapter, _SingleFlight
+
+
+@final
+@dataclass(frozen=True)
+class CacheStatistics:
+    """Hits include the disk hits, files that were only found in the disk cache."""
+
+    hits: int
+    disk_hits: int
+    misses: int
+    evictions: int
+    disk_evictions: int
+    size: int
+    disk_size: int
+
+
+# The hashed path of a cached file, with the suffix of a temporary file while it is written.
+_DISK_FILE = re.compile(r"[0-9a-f]{64}(\.[0-9a-f]{32})?")
+
+
+def _clear_disk_cache(disk_path: str) -> None:
+    with os.scandir(disk_path) as entries:
+        for entry in entries:
+            if _DISK_FILE.fullmatch(entry.name) and entry.is_file():
+                os.remove(entry.path)
+
+
+def _is_current(cached: FileMetadata, current: FileMetadata) -> bool:
+    if cached.etag is not None and current.etag is not None:
+        return cached.etag == current.etag
+
+    return (
+        cached.last_modified is not None
+        and cached.last_modified == current.last_modified
+        and cached.size == current.size
+    )
+
+
+@final
+class _Generations:
+    """The generation of every key with lookups in progress, a write bumps it to tell those
+    lookups that their result may be outdated and must not be stored."""
+
+    _generations: dict[str, int]
+    _lookups: dict[str, int]
+
+    def __init__(self) -> None:
+        self._generations = {}
+        self._lookups = {}
+
+    @contextmanager
+    def track(self, key: str) -> Iterator[Callable[[], bool]]:
+        """Yields a check whether the key was not invalidated since the lookup started."""
+        generation = self._generations.setdefault(key, 0)
+        self._lookups[key] = self._lookups.get(key, 0) + 1
+        try:
+            yield lambda: self._generations[key] == generation
+        finally:
+            self._lookups[key] -= 1
+            if self._lookups[key] == 0:
+                del self._lookups[key]
+                del self._generations[key]
+
+    def invalidate(self, key: str) -> None:
+        if key in self._generations:
+            self._generations[key] += 1
+
+
+@final
+class CachingAdapter(WrappingAdapter):
+    """Keeps the data of files that were read in memory, the least recently used files are
+    evicted when the cache grows beyond max size. Files evicted from memory stay available
+    from the optional disk cache in the disk path, up to disk max size.
+
+    Unless validation is disabled, a cached file is only used when its etag, or its
+    modification time and size, still match the wrapped adapter. That costs a metadata
+    request instead of transferring the data. Without validation only writes and deletes
+    through this adapter invalidate the cache.
+
+    The files in the disk path that were cached earlier are removed when the adapter is
+    created, as they can not be validated, so every adapter needs a disk path of its own.
+    """
+
+    _max_size: int
+    _validate: bool
+    _memory: OrderedDict[str, tuple[FileMetadata, bytes]]
+    _size: int
+    _disk: LocalAdapter | None
+    _disk_path: str | None
+    _disk_max_size: int
+    _disk_index: OrderedDict[str, FileMetadata]
+    _disk_size: int
+    _hits: int
+    _disk_hits: int
+    _misses: int
+    _evictions: int
+    _disk_evictions: int
+    _generations: _Generations
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        max_size: int = 64 * 1024 * 1024,
+        disk_path: str | None = None,
+        disk_max_size: int = 1024 * 1024 * 1024,
+        validate: bool = True,
+    ) -> None:
+        super().__init__(adapter)
+        self._max_size = max_size
+        self._validate = validate
+        self._memory = OrderedDict()
+        self._size = 0
+        self._disk = None if disk_path is None else LocalAdapter()
+        self._disk_path = disk_path
+        self._disk_max_size = disk_max_size
+        self._disk_index = OrderedDict()
+        self._disk_size = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._disk_evictions = 0
+        self._generations = _Generations()
+
+        if disk_path is not None:
+            os.makedirs(disk_path, exist_ok=True)
+            _clear_disk_cache(disk_path)
+
+    @property
+    def statistics(self) -> CacheStatistics:
+        return CacheStatistics(
+            hits=self._hits,
+            disk_hits=self._disk_hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            disk_evictions=self._disk_evictions,
+            size=self._size,
+            disk_size=self._disk_size,
+        )
+
+    async def read(self, path: str) -> bytes:
+        with self._generations.track(path) as is_current:
+            metadata = (
+                await self._adapter.get_metadata(path) if self._validate else None
+            )
+
+            data = await self._get(path, metadata, is_current)
+            if data is not None:
+                self._hits += 1
+                return data
+
+            self._misses += 1
+            data = await self._adapter.read(path)
+            if metadata is None:
+                metadata = await self._adapter.get_metadata(path)
+
+            # Metadata from before the read, a change in between fails the next validation.
+            await self._put(path, metadata, data, is_current)
+
+        return data
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        _check_range(offset, length)
+        with self._generations.track(path) as is_current:
+            metadata = (
+                await self._adapter.get_metadata(path) if self._validate else None
+            )
+            data = await self._get(path, metadata, is_current)
+
+        if data is None:
+            self._misses += 1
+            return await self._adapter.read_range(path, offset, length)
+
+        self._hits += 1
+        return data[offset:] if length is None else data[offset : offset + length]
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        _check_chunks(chunk_size, read_ahead)
+        with self._generations.track(path) as is_current:
+            metadata = (
+                await self._adapter.get_metadata(path) if self._validate else None
+            )
+            data = await self._get(path, metadata, is_current)
+
+        if data is None:
+            self._misses += 1
+            return await self._adapter.get_iterator(path, chunk_size, read_ahead)
+
+        self._hits += 1
+        size = chunk_size or max(len(data), 1)
+
+        async def iterate() -> AsyncIterator[bytes]:
+            for offset in range(0, len(data), size):
+                yield data[offset : offset + size]
+
+        return iterate()
+
+    async def write(self, path: str, data: bytes) -> File:
+        try:
+            return await super().write(path, data)
+        finally:
+            await self.invalidate(path)
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        try:
+            return await super().write_iterator(path, iterator)
+        finally:
+            await self.invalidate(path)
+
+    async def copy(self, source: str, destination: str) -> File:
+        try:
+            return await super().copy(source, destination)
+        finally:
+            await self.invalidate(destination)
+
+    async def move(self, source: str, destination: str) -> File:
+        try:
+            return await super().move(source, destination)
+        finally:
+            await self.invalidate(source)
+            await self.invalidate(destination)
+
+    async def delete(self, path: str) -> None:
+        try:
+            await super().delete(path)
+        finally:
+            await self.invalidate(path)
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        try:
+            return await super().delete_many(paths, max_concurrency)
+        finally:
+            for path in paths:
+                await self.invalidate(path)
+
+    async def invalidate(self, path: str) -> None:
+        """Forgets the data of the path, reads of it that were in progress do not cache it."""
+        self._generations.invalidate(path)
+        await self._forget(path)
+
+    async def _forget(self, path: str) -> None:
+        entry = self._memory.pop(path, None)
+        if entry is not None:
+            self._size -= len(entry[1])
+
+        if path in self._disk_index:
+            await self._remove_from_disk(path)
+
+    async def _get(
+        self,
+        path: str,
+        metadata: FileMetadata | None,
+        is_current: Callable[[], bool],
+    ) -> bytes | None:
+        entry = self._memory.get(path)
+        if entry is not None:
+            if metadata is None or _is_current(entry[0], metadata):
+                self._memory.move_to_end(path)
+                return entry[1]
+
+            await self._forget(path)
+            return None
+
+        cached = self._disk_index.get(path)
+        if cached is None or self._disk is None:
+            return None
+
+        if metadata is not None and not _is_current(cached, metadata):
+            await self._forget(path)
+            return None
+
+        try:
+            data = await self._disk.read(self._to_disk_path(path))
+        except NotFoundException:
+            # Removed from the disk cache by another operation in the meantime.
+            return None
+
+        if not is_current():
+            return None
+
+        self._disk_hits += 1
+        if path in self._disk_index:
+            self._disk_index.move_to_end(path)
+        self._put_in_memory(path, cached, data)
+
+        return data
+
+    async def _put(
+        self,
+        path: str,
+        metadata: FileMetadata,
+        data: bytes,
+        is_current: Callable[[], bool],
+    ) -> None:
+        # A write or delete during the read may have made the data outdated.
+        if not is_current():
+            return
+
+        self._put_in_memory(path, metadata, data)
+
+        if self._disk is None or len(data) > self._disk_max_size:
+            return
+
+        # Readers never see a partially written file.
+        disk_path = self._to_disk_path(path)
+        temporary_path = f"{disk_path}.{uuid4().hex}"
+        try:
+            await self._disk.write(temporary_path, data)
+            await self._disk.move(temporary_path, disk_path)
+        finally:
+            try:
+                await self._disk.delete(temporary_path)
+            except NotFoundException:
+                """Moved into place, there is nothing left to remove."""
+        if not is_current():
+            # Invalidated while writing to the disk cache.
+            await self._disk.delete(disk_path)
+            return
+
+        if path in self._disk_index:
+            self._disk_size -= self._disk_index[path].size
+
+        self._disk_index[path] = FileMetadata(
+            size=len(data),
+            last_modified=metadata.last_modified,
+            etag=metadata.etag,
+        )
+        self._disk_size += len(data)
+
+        while self._disk_size > self._disk_max_size:
+            await self._remove_from_disk(next(iter(self._disk_index)))
+            self._disk_evictions += 1
+
+    def _put_in_memory(self, path: str, metadata: FileMetadata, data: bytes) -> None:
+        if len(data) > self._max_size:
+            return
+
+        previous = self._memory.pop(path, None)
+        if previous is not None:
+            self._size -= len(previous[1])
+
+        self._memory[path] = (metadata, data)
+        self._size += len(data)
+
+        while self._size > self._max_size:
+            _, (_, evicted) = self._memory.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
+
+    async def _remove_from_disk(self, path: str) -> None:
+        if self._disk is None:
+            return
+
+        cached = self._disk_index.pop(path, None)
+        if cached is None:
+            return
+
+        self._disk_size -= cached.size
+        try:
+            await self._disk.delete(self._to_disk_path(path))
+        except NotFoundException:
+            """The file is already gone, there is nothing left to remove."""
+
+    def _to_disk_path(self, path: str) -> str:
+        return f"{self._disk_path}/{hashlib.sha256(path.encode()).hexdigest()}"
+
+
+def _listing_key(path: str) -> str:
+    """Ignores a trailing slash, except for the root "/" which differs from the empty path."""
+    return path.rstrip("/") or path
+
+
+def _parent(path: str) -> str:
+    directory, separator, _ = _listing_key(path).rpartition("/")
+
+    return directory or separator
+
+
+@final
+class MetadataCachingAdapter(WrappingAdapter):
+    """Keeps directory listings and the metadata of files, or the fact that they do not
+    exist, for ttl seconds. Concurrent identical lookups that are not cached yet share a
+    single request to the wrapped adapter. Writes and deletes through this adapter
+    invalidate the affected entries, changes made elsewhere show after at most ttl seconds.
+    """
+
+    _ttl: float
+    _max_entries: int
+    _files: dict[str, tuple[float, FileMetadata | NotFoundException]]
+    _listings: dict[str, tuple[float, DirectoryListing | NotFoundException]]
+    _metadata_lookups: _SingleFlight[FileMetadata | NotFoundException]
+    _listing_lookups: _SingleFlight[DirectoryListing | NotFoundException]
+    _file_generations: _Generations
+    _listing_generations: _Generations
+
+    def __init__(
+        self, adapter: Adapter, ttl: float = 30.0, max_entries: int = 10000
+    ) -> None:
+        super().__init__(adapter)
+        self._ttl = ttl
+        self._max_entries = max_entries
+        self._files = {}
+        self._listings = {}
+        self._file_generations = _Generations()
+        self._listing_generations = _Generations()
+        self._metadata_lookups = _SingleFlight()
+        self._listing_lookups = _SingleFlight()
+
+    async def list(self, path: str) -> DirectoryListing:
+        key = _listing_key(path)
+        listing = self._lookup(self._listings, key)
+        if listing is None:
+            listing = await self._listing_lookups.run(
+                key, lambda: self._load_listing(path)
+            )
+
+        if isinstance(listing, NotFoundException):
+            raise NotFoundException(*listing.args)
+
+        return listing
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        metadata = self._lookup(self._files, path)
+        if metadata is None:
+            metadata = await self._metadata_lookups.run(
+                path, lambda: self._load_metadata(path)
+            )
+
+        if isinstance(metadata, NotFoundException):
+            raise NotFoundException(*metadata.args)
+
+        return metadata
+
+    async def get_file(self, path: str) -> File:
+        return WrappedFile(path, self, await self.get_metadata(path))
+
+    async def write(self, path: str, data: bytes) -> File:
+        try:
+            return await super().write(path, data)
+        finally:
+            self.invalidate(path)
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        try:
+            return await super().write_iterator(path, iterator)
+        finally:
+            self.invalidate(path)
+
+    async def copy(self, source: str, destination: str) -> File:
+        try:
+            return await super().copy(source, destination)
+        finally:
+            self.invalidate(destination)
+
+    async def move(self, source: str, destination: str) -> File:
+        try:
+            return await super().move(source, destination)
+        finally:
+            self.invalidate(source)
+            self.invalidate(destination)
+
+    async def makedirs(self, path: str) -> None:
+        try:
+            await super().makedirs(path)
+        finally:
+            self.invalidate(path)
+
+    async def delete(self, path: str) -> None:
+        try:
+            await super().delete(path)
+        finally:
+            self.invalidate(path)
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        try:
+            return await super().delete_many(paths, max_concurrency)
+        finally:
+            for path in paths:
+                self.invalidate(path)
+
+    def invalidate(self, path: str) -> None:
+        """Forgets the metadata of the path and the listing of its directory, lookups of them
+        that were in progress do not store their result."""
+        self._file_generations.invalidate(path)
+        self._files.pop(path, None)
+
+        for key in [_listing_key(path), _parent(path)]:
+            self._listing_generations.invalidate(key)
+            self._listings.pop(key, None)
+
+    def _lookup[T](self, entries: dict[str, tuple[float, T]], key: str) -> T | None:
+        entry = entries.get(key)
+        if entry is None:
+            return None
+
+        expires, value = entry
+        if expires < time.monotonic():
+            del entries[key]
+            return None
+
+        return value
+
+    def _store[T](
+        self, entries: dict[str, tuple[float, T]], key: str, value: T
+    ) -> None:
+        entries.pop(key, None)
+        entries[key] = (time.monotonic() + self._ttl, value)
+        if len(entries) > self._max_entries:
+            # The oldest entry, entries are kept in the order they were stored.
+            del entries[next(iter(entries))]
+
+    async def _load_listing(self, path: str) -> DirectoryListing | NotFoundException:
+        key = _listing_key(path)
+        listing: DirectoryListing | NotFoundException
+        with self._listing_generations.track(key) as is_current:
+            try:
+                listing = await super().list(path)
+            except NotFoundException as exception:
+                listing = exception
+
+            # A write or delete during the lookup may have made the result outdated, a
+            # write to one of its files also invalidates the listing.
+            if not is_current():
+                return listing
+
+        if not isinstance(listing, NotFoundException):
+            for item in listing:
+                if isinstance(item, File) and item._metadata is not None:
+                    self._store(self._files, item.path, item._metadata)
+
+        self._store(self._listings, key, listing)
+
+        return listing
+
+    async def _load_metadata(self, path: str) -> FileMetadata | NotFoundException:
+        metadata: FileMetadata | NotFoundException
+        with self._file_generations.track(path) as is_current:
+            try:
+                metadata = await super().get_metadata(path)
+            except NotFoundException as exception:
+                metadata = exception
+
+            if is_current():
+                self._store(self._files, path, metadata)
+
+        return metadata
+
+
+@final
+class SingleFlightAdapter(WrappingAdapter):
+    """Concurrent identical reads and lookups share a single request to the wrapped adapter
+    and its result, without keeping the result once the request has completed."""
+
+    _reads: _SingleFlight[bytes]
+    _range_reads: _SingleFlight[bytes]
+    _files: _SingleFlight[File]
+    _metadata: _SingleFlight[FileMetadata]
+
+    def __init__(self, adapter: Adapter) -> None:
+        super().__init__(adapter)
+        self._reads = _SingleFlight()
+        self._range_reads = _SingleFlight()
+        self._files = _SingleFlight()
+        self._metadata = _SingleFlight()
+
+    async def read(self, path: str) -> bytes:
+        return await self._reads.run(path, partial(super().read, path))
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._range_reads.run(
+            f"{offset}:{length}:{path}",
+            partial(super().read_range, path, offset, length),
+        )
+
+    async def get_file(self, path: str) -> File:
+        return await self._files.run(path, partial(super().get_file, path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await self._metadata.run(path, partial(super().get_metadata, path))
@@ -1,5 +1,10 @@
+import asyncio
+import glob
+import re
 from abc import ABCMeta, abstractmethod
-from collections.abc import Sequence
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
 from typing import AsyncIterator, final
 
 
@@ -20,16 +25,48 @@ DirectoryListing = Sequence[_FilesystemItem]
 class Directory(_FilesystemItem): ...
 
 
+@final
+@dataclass(frozen=True)
+class FileMetadata:
+    size: int
+    last_modified: datetime | None = None
+    etag: str | None = None
+    content_type: str | None = None
+
+
 class File(_FilesystemItem, metaclass=ABCMeta):
+    _metadata: FileMetadata | None
+
+    def __init__(self, path: str, metadata: FileMetadata | None = None):
+        super().__init__(path)
+        self._metadata = metadata
+
+    @property
+    async def size(self) -> int:
+        return (await self.metadata).size
+
     @property
+    async def metadata(self) -> FileMetadata:
+        """Adapters provide the metadata they received while listing or looking up the file,
+        it is only loaded from the storage backend when it was not provided."""
+        if self._metadata is None:
+            self._metadata = await self._load_metadata()
+
+        return self._metadata
+
     @abstractmethod
-    async def size(self) -> int: ...
+    async def _load_metadata(self) -> FileMetadata: ...
 
     @abstractmethod
     async def read(self) -> bytes: ...
 
     @abstractmethod
-    async def get_iterator(self) -> AsyncIterator[bytes]: ...
+    async def read_range(self, offset: int, length: int | None = None) -> bytes: ...
+
+    @abstractmethod
+    async def get_iterator(
+        self, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]: ...
 
     @abstractmethod
     async def delete(self) -> None: ...
@@ -38,19 +75,135 @@ class File(_FilesystemItem, metaclass=ABCMeta):
 class NotFoundException(Exception): ...
 
 
+def _check_range(offset: int, length: int | None) -> None:
+    if offset < 0:
+        raise ValueError(f"Offset must not be negative, got {offset}!")
+
+    if length is not None and length < 0:
+        raise ValueError(f"Length must not be negative, got {length}!")
+
+
+def _check_chunks(chunk_size: int | None, read_ahead: int = 0) -> None:
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError(f"Chunk size must be positive, got {chunk_size}!")
+
+    if read_ahead < 0:
+        raise ValueError(f"Read ahead must not be negative, got {read_ahead}!")
+
+
+async def _map_paths[T](
+    paths: Iterable[str],
+    operation: Callable[[str], Awaitable[T]],
+    max_concurrency: int,
+) -> list[T | NotFoundException]:
+    """Runs the operation for all paths, at most max concurrency at the same time. A path that
+    is not found results in its exception instead of aborting the other operations."""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(path: str) -> T | NotFoundException:
+        async with semaphore:
+            try:
+                return await operation(path)
+            except NotFoundException as exception:
+                return exception
+
+    return list(await asyncio.gather(*(run(path) for path in paths)))
+
+
+async def _read_ahead[T](iterator: AsyncIterator[T], depth: int) -> AsyncIterator[T]:
+    """Keeps reading up to depth items from the iterator while the consumer processes the
+    current item."""
+    loop = asyncio.get_running_loop()
+    # Completed futures hold the items or the exception of the iterator, None its end.
+    queue: asyncio.Queue[asyncio.Future[T] | None] = asyncio.Queue(depth)
+
+    async def produce() -> None:
+        try:
+            async for item in iterator:
+                future = loop.create_future()
+                future.set_result(item)
+                await queue.put(future)
+        except Exception as exception:
+            future = loop.create_future()
+            future.set_exception(exception)
+            await queue.put(future)
+        else:
+            await queue.put(None)
+
+    task = asyncio.create_task(produce())
+    try:
+        while (future := await queue.get()) is not None:
+            yield future.result()
+    finally:
+        task.cancel()
+
+
 class Adapter(metaclass=ABCMeta):
+    """The operations that are not abstract have a default built on the abstract ones, the
+    adapters override them where the storage backend can do better."""
+
     @abstractmethod
     async def list(self, path: str) -> DirectoryListing: ...
 
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        listing = await self.list(path)
+
+        async def iterate() -> AsyncIterator[_FilesystemItem]:
+            for item in listing:
+                yield item
+
+        return iterate()
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        """Iterates over all files below the directory, recursively. Only the entries of the
+        directory whose name starts with the name prefix are included."""
+        listing = await self.list(path)
+
+        async def iterate() -> AsyncIterator[File]:
+            directories = []
+            for item in listing:
+                if not item.path.rstrip("/").rpartition("/")[2].startswith(name_prefix):
+                    continue
+
+                if isinstance(item, File):
+                    yield item
+                elif isinstance(item, Directory):
+                    directories.append(item.path)
+
+            for directory in directories:
+                async for file in await self.walk(directory):
+                    yield file
+
+        return iterate()
+
     @abstractmethod
     async def read(self, path: str) -> bytes: ...
 
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        """Reads at most length bytes starting at the offset, or everything from the offset
+        onwards when no length is given. Reading beyond the end of the file returns fewer or
+        no bytes. A negative offset or length raises a ValueError."""
+        _check_range(offset, length)
+        data = await self.read(path)
+
+        return data[offset:] if length is None else data[offset : offset + length]
+
     @abstractmethod
-    async def get_iterator(self, path: str) -> AsyncIterator[bytes]: ...
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        """Iterates over the data in chunks of at most the chunk size, or the default chunk
+        size of the adapter. The read ahead is the number of chunks that are read while the
+        current chunk is being processed."""
 
     @abstractmethod
     async def get_file(self, path: str) -> File: ...
 
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await (await self.get_file(path)).metadata
+
     @abstractmethod
     async def write(self, path: str, data: bytes) -> File: ...
 
@@ -59,12 +212,33 @@ class Adapter(metaclass=ABCMeta):
         self, path: str, iterator: AsyncIterator[bytes]
     ) -> File: ...
 
+    async def copy(self, source: str, destination: str) -> File:
+        """Copies the file within the storage backend, without transferring its data through
+        this process where the backend allows it."""
+        return await self.write_iterator(destination, await self.get_iterator(source))
+
+    async def move(self, source: str, destination: str) -> File:
+        if source == destination:
+            return await self.get_file(source)
+
+        file = await self.copy(source, destination)
+        await self.delete(source)
+
+        return file
+
     @abstractmethod
     async def makedirs(self, path: str) -> None: ...
 
     @abstractmethod
     async def delete(self, path: str) -> None: ...
 
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        """Deletes all paths, the result holds an exception for each path that was not found
+        in the same position as the path."""
+        return await _map_paths(paths, self.delete, max_concurrency)
+
 
 @final
 class Filesystem:
@@ -76,17 +250,105 @@ class Filesystem:
     async def list(self, path: str) -> DirectoryListing:
         return await self._adapter.list(path)
 
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        return await self._adapter.iter_list(path)
+
+    async def walk(self, path: str) -> AsyncIterator[File]:
+        return await self._adapter.walk(path)
+
+    async def glob(self, pattern: str) -> AsyncIterator[File]:
+        """Iterates over the files whose path matches the pattern. A `*` does not match across
+        directories, `**` matches any number of nested directories.
+        The literal part of the pattern determines where the search starts, so only that part
+        of the filesystem is walked. Patterns without a directory start at the root when they
+        are absolute, and at the root of the adapter, the current directory of a local
+        filesystem, when they are relative."""
+        expression = re.compile(
+            glob.translate(pattern, recursive=True, include_hidden=True, seps="/")
+        )
+        literal = re.split(r"[*?\[]", pattern, maxsplit=1)[0]
+        directory, _, name_prefix = literal.rpartition("/")
+        if directory == "" and pattern.startswith("/"):
+            directory = "/"
+
+        files = await self._adapter.walk(directory, name_prefix)
+
+        async def iterate() -> AsyncIterator[File]:
+            async for file in files:
+                if expression.match(file.path):
+                    yield file
+
+        return iterate()
+
     async def get_file(self, path: str) -> File:
         return await self._adapter.get_file(path)
 
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(path, chunk_size, read_ahead)
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._adapter.read_range(path, offset, length)
+
     async def write(self, path: str, data: bytes) -> File:
         return await self._adapter.write(path, data)
 
     async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
         return await self._adapter.write_iterator(path, iterator)
 
+    def _shares_storage(self, target: "Filesystem") -> bool:
+        # The local adapter imports this module.
+        from plugfs.local import LocalAdapter
+
+        return (
+            target._adapter is self._adapter
+            or isinstance(self._adapter, LocalAdapter)
+            and isinstance(target._adapter, LocalAdapter)
+        )
+
+    async def copy(
+        self, source: str, destination: str, target: "Filesystem | None" = None
+    ) -> File:
+        """Copies the file to the destination path, in the target filesystem when one is given.
+        Within the same adapter, or between local adapters, the copy is done by the storage
+        backend, to another adapter the file is streamed in chunks."""
+        if target is None or self._shares_storage(target):
+            return await self._adapter.copy(source, destination)
+
+        iterator = await self._adapter.get_iterator(source)
+        return await target._adapter.write_iterator(destination, iterator)
+
+    async def move(
+        self, source: str, destination: str, target: "Filesystem | None" = None
+    ) -> File:
+        if target is None or self._shares_storage(target):
+            return await self._adapter.move(source, destination)
+
+        file = await self.copy(source, destination, target)
+        await self._adapter.delete(source)
+
+        return file
+
     async def makedirs(self, path: str) -> None:
         await self._adapter.makedirs(path)
 
     async def delete(self, path: str) -> None:
         await self._adapter.delete(path)
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int = 16
+    ) -> Sequence[NotFoundException | None]:
+        return await self._adapter.delete_many(paths, max_concurrency)
+
+    async def get_files(
+        self, paths: Iterable[str], max_concurrency: int = 16
+    ) -> Sequence[File | NotFoundException]:
+        return await _map_paths(paths, self._adapter.get_file, max_concurrency)
+
+    async def read_many(
+        self, paths: Iterable[str], max_concurrency: int = 16
+    ) -> Sequence[bytes | NotFoundException]:
+        return await _map_paths(paths, self._adapter.read, max_concurrency)
@@ -0,0 +1,272 @@
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Mapping, Sequence
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from typing import AsyncIterator, final
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _FilesystemItem,
+)
+from plugfs.wrapper import WrappingAdapter
+
+# Upper bounds in seconds, the last bucket counts everything slower.
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+SpanFactory = Callable[[str, Mapping[str, str]], AbstractContextManager[object]]
+
+
+@final
+@dataclass(frozen=True)
+class OperationStatistics:
+    """The latencies hold the number of calls per bucket of LATENCY_BUCKETS, followed by the
+    number of calls slower than the last bucket."""
+
+    calls: int
+    errors: int
+    in_flight: int
+    max_in_flight: int
+    bytes_read: int
+    bytes_written: int
+    latencies: tuple[int, ...]
+    total_latency: float
+
+
+@final
+class _Counters:
+    calls: int
+    errors: int
+    in_flight: int
+    max_in_flight: int
+    bytes_read: int
+    bytes_written: int
+    latencies: list[int]
+    total_latency: float
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.latencies = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_latency = 0.0
+
+    def snapshot(self) -> OperationStatistics:
+        return OperationStatistics(
+            calls=self.calls,
+            errors=self.errors,
+            in_flight=self.in_flight,
+            max_in_flight=self.max_in_flight,
+            bytes_read=self.bytes_read,
+            bytes_written=self.bytes_written,
+            latencies=tuple(self.latencies),
+            total_latency=self.total_latency,
+        )
+
+
+@final
+class InstrumentedAdapter(WrappingAdapter):
+    """Records per operation the number of calls and errors, a latency histogram, the bytes
+    read and written and the number of calls in flight. With a span factory every call
+    runs within a span, for example of an OpenTelemetry tracer::
+
+        InstrumentedAdapter(
+            adapter,
+            span_factory=lambda name, attributes: tracer.start_as_current_span(
+                name, attributes=attributes
+            ),
+        )
+
+    The latency of iterators is the time until the iterator is returned, their bytes are
+    counted while iterating. While disabled, calls are passed on without recording them.
+    """
+
+    name: str
+    enabled: bool
+    _span_factory: SpanFactory | None
+    _counters: dict[str, _Counters]
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        name: str | None = None,
+        span_factory: SpanFactory | None = None,
+        enabled: bool = True,
+    ) -> None:
+        super().__init__(adapter)
+        self.name = type(adapter).__name__ if name is None else name
+        self.enabled = enabled
+        self._span_factory = span_factory
+        self._counters = {}
+
+    @property
+    def statistics(self) -> Mapping[str, OperationStatistics]:
+        return {
+            operation: counters.snapshot()
+            for operation, counters in self._counters.items()
+        }
+
+    def reset(self) -> None:
+        self._counters = {}
+
+    async def _instrument[T](
+        self,
+        operation: str,
+        path: str,
+        call: Awaitable[T],
+        bytes_read: Callable[[T], int] | None = None,
+        bytes_written: int = 0,
+    ) -> T:
+        if not self.enabled:
+            return await call
+
+        counters = self._counters.get(operation)
+        if counters is None:
+            counters = self._counters[operation] = _Counters()
+
+        counters.calls += 1
+        counters.in_flight += 1
+        counters.max_in_flight = max(counters.max_in_flight, counters.in_flight)
+        span = (
+            nullcontext()
+            if self._span_factory is None
+            else self._span_factory(
+                f"plugfs.{operation}",
+                {"plugfs.adapter": self.name, "plugfs.path": path},
+            )
+        )
+        start = time.perf_counter()
+        try:
+            with span:
+                result = await call
+        except Exception:
+            counters.errors += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            counters.in_flight -= 1
+            counters.total_latency += latency
+            counters.latencies[bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        counters.bytes_written += bytes_written
+        if bytes_read is not None:
+            counters.bytes_read += bytes_read(result)
+
+        return result
+
+    def _count_read(
+        self, operation: str, iterator: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        counters = self._counters.get(operation)
+        if not self.enabled or counters is None:
+            return iterator
+
+        async def iterate() -> AsyncIterator[bytes]:
+            async for chunk in iterator:
+                counters.bytes_read += len(chunk)
+                yield chunk
+
+        return iterate()
+
+    def _count_written(
+        self, operation: str, iterator: AsyncIterator[bytes]
+    ) -> AsyncIterator[bytes]:
+        if not self.enabled:
+            return iterator
+
+        async def iterate() -> AsyncIterator[bytes]:
+            async for chunk in iterator:
+                counters = self._counters.get(operation)
+                if counters is not None:
+                    counters.bytes_written += len(chunk)
+                yield chunk
+
+        return iterate()
+
+    async def list(self, path: str) -> DirectoryListing:
+        return await self._instrument("list", path, super().list(path))
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        return await self._instrument("iter_list", path, super().iter_list(path))
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        return await self._instrument("walk", path, super().walk(path, name_prefix))
+
+    async def read(self, path: str) -> bytes:
+        return await self._instrument("read", path, super().read(path), len)
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._instrument(
+            "read_range", path, super().read_range(path, offset, length), len
+        )
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        iterator = await self._instrument(
+            "get_iterator", path, super().get_iterator(path, chunk_size, read_ahead)
+        )
+
+        return self._count_read("get_iterator", iterator)
+
+    async def get_file(self, path: str) -> File:
+        return await self._instrument("get_file", path, super().get_file(path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await self._instrument("get_metadata", path, super().get_metadata(path))
+
+    async def write(self, path: str, data: bytes) -> File:
+        return await self._instrument(
+            "write", path, super().write(path, data), bytes_written=len(data)
+        )
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        return await self._instrument(
+            "write_iterator",
+            path,
+            super().write_iterator(
+                path, self._count_written("write_iterator", iterator)
+            ),
+        )
+
+    async def copy(self, source: str, destination: str) -> File:
+        return await self._instrument("copy", source, super().copy(source, destination))
+
+    async def move(self, source: str, destination: str) -> File:
+        return await self._instrument("move", source, super().move(source, destination))
+
+    async def makedirs(self, path: str) -> None:
+        await self._instrument("makedirs", path, super().makedirs(path))
+
+    async def delete(self, path: str) -> None:
+        await self._instrument("delete", path, super().delete(path))
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        return await self._instrument(
+            "delete_many", "", super().delete_many(paths, max_concurrency)
+        )
@@ -0,0 +1,232 @@
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import final
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _FilesystemItem,
+)
+from plugfs.wrapper import WrappingAdapter
+
+
+@final
+@dataclass(frozen=True)
+class LimitStatistics:
+    in_flight: int
+    bytes_in_flight: int
+    waiting: int
+
+
+@final
+class _FairLimit:
+    """Grants amounts of a capacity in the order they were requested, a large request at the
+    front of the queue is not overtaken by the smaller requests behind it. Requests larger
+    than the capacity are granted the whole capacity."""
+
+    _capacity: int
+    _available: int
+    _waiters: deque[tuple[int, asyncio.Future[None]]]
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError(f"Capacity must be at least 1, got {capacity}!")
+
+        self._capacity = capacity
+        self._available = capacity
+        self._waiters = deque()
+
+    @property
+    def used(self) -> int:
+        return self._capacity - self._available
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, future in self._waiters if not future.done())
+
+    async def acquire(self, amount: int) -> int:
+        """Returns the granted amount, which has to be released."""
+        amount = min(amount, self._capacity)
+        if amount <= 0:
+            return 0
+
+        if not self._waiters and amount <= self._available:
+            self._available -= amount
+            return amount
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((amount, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.cancelled():
+                # The waiter may have blocked the queue, the next ones may fit now.
+                self._wake()
+            else:
+                # Granted, but cancelled before the grant was used.
+                self.release(amount)
+            raise
+
+        return amount
+
+    def release(self, amount: int) -> None:
+        self._available += amount
+        self._wake()
+
+    def _wake(self) -> None:
+        while self._waiters:
+            amount, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+
+            if amount > self._available:
+                return
+
+            self._waiters.popleft()
+            self._available -= amount
+            future.set_result(None)
+
+
+@final
+class LimitingAdapter(WrappingAdapter):
+    """Limits the number of operations that run on the wrapped adapter at the same time and,
+    optionally, the number of bytes they transfer. Operations over the limits wait in a
+    first in, first out queue, so a steady stream of small operations can not starve a large
+    one.
+
+    The bytes of write, of every chunk of write_iterator while the wrapped adapter writes it
+    and the length of read_range are counted against max bytes. The size of read and of
+    iterators is not known up front, those only count against max concurrency. Iterators
+    count as in flight until they are returned, not while they are consumed. A delete many
+    counts as its max concurrency operations."""
+
+    _concurrency: _FairLimit
+    _bytes: _FairLimit | None
+
+    def __init__(
+        self, adapter: Adapter, max_concurrency: int = 64, max_bytes: int | None = None
+    ) -> None:
+        super().__init__(adapter)
+        self._concurrency = _FairLimit(max_concurrency)
+        self._bytes = None if max_bytes is None else _FairLimit(max_bytes)
+
+    @property
+    def statistics(self) -> LimitStatistics:
+        return LimitStatistics(
+            in_flight=self._concurrency.used,
+            bytes_in_flight=0 if self._bytes is None else self._bytes.used,
+            waiting=self._concurrency.waiting
+            + (0 if self._bytes is None else self._bytes.waiting),
+        )
+
+    @asynccontextmanager
+    async def _slots(self, count: int = 1) -> AsyncIterator[None]:
+        granted = await self._concurrency.acquire(count)
+        try:
+            yield
+        finally:
+            self._concurrency.release(granted)
+
+    @asynccontextmanager
+    async def _budget(self, size: int) -> AsyncIterator[None]:
+        if self._bytes is None:
+            yield
+            return
+
+        granted = await self._bytes.acquire(size)
+        try:
+            yield
+        finally:
+            self._bytes.release(granted)
+
+    async def _limit[T](
+        self, operation: Callable[[], Awaitable[T]], size: int = 0
+    ) -> T:
+        # The slot is taken first, an operation holding bytes is always running.
+        async with self._slots(), self._budget(size):
+            return await operation()
+
+    def _limit_chunks(self, iterator: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        limit = self._bytes
+        if limit is None:
+            return iterator
+
+        async def iterate() -> AsyncIterator[bytes]:
+            # A chunk is in flight until the wrapped adapter asks for the next one.
+            granted = 0
+            try:
+                async for chunk in iterator:
+                    granted = await limit.acquire(len(chunk))
+                    yield chunk
+                    limit.release(granted)
+                    granted = 0
+            finally:
+                limit.release(granted)
+
+        return iterate()
+
+    async def list(self, path: str) -> DirectoryListing:
+        return await self._limit(partial(super().list, path))
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        return await self._limit(partial(super().iter_list, path))
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        return await self._limit(partial(super().walk, path, name_prefix))
+
+    async def read(self, path: str) -> bytes:
+        return await self._limit(partial(super().read, path))
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._limit(
+            partial(super().read_range, path, offset, length), length or 0
+        )
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._limit(
+            partial(super().get_iterator, path, chunk_size, read_ahead)
+        )
+
+    async def get_file(self, path: str) -> File:
+        return await self._limit(partial(super().get_file, path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await self._limit(partial(super().get_metadata, path))
+
+    async def write(self, path: str, data: bytes) -> File:
+        return await self._limit(partial(super().write, path, data), len(data))
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        return await self._limit(
+            partial(super().write_iterator, path, self._limit_chunks(iterator))
+        )
+
+    async def copy(self, source: str, destination: str) -> File:
+        return await self._limit(partial(super().copy, source, destination))
+
+    async def move(self, source: str, destination: str) -> File:
+        return await self._limit(partial(super().move, source, destination))
+
+    async def makedirs(self, path: str) -> None:
+        await self._limit(partial(super().makedirs, path))
+
+    async def delete(self, path: str) -> None:
+        await self._limit(partial(super().delete, path))
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        async with self._slots(max_concurrency):
+            return await super().delete_many(paths, max_concurrency)
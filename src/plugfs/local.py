@@ -1,94 +1,511 @@
-from typing import AsyncIterator, final
-
-import aiofiles
-from aiofiles.os import listdir, makedirs, remove
-from aiofiles.ospath import exists, getsize, isdir, isfile
+import asyncio
+import errno
+import io
+import mimetypes
+import mmap
+import os
+import shutil
+import stat as stat_module
+import sys
+from collections.abc import AsyncGenerator, Callable, Sequence
+from concurrent.futures import Executor
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from datetime import datetime, timezone
+from functools import partial
+from itertools import islice
+from typing import AsyncIterator, BinaryIO, Iterator, final
 
 from plugfs.filesystem import (
     Adapter,
     Directory,
     DirectoryListing,
     File,
+    FileMetadata,
     NotFoundException,
+    _check_chunks,
+    _check_range,
     _FilesystemItem,
+    _map_paths,
+    _read_ahead,
 )
 
 
+def _to_metadata(path: str, stat_result: os.stat_result) -> FileMetadata:
+    return FileMetadata(
+        size=stat_result.st_size,
+        last_modified=datetime.fromtimestamp(stat_result.st_mtime, tz=timezone.utc),
+        etag=f"{stat_result.st_ino:x}-{stat_result.st_mtime_ns:x}-{stat_result.st_size:x}",
+        content_type=mimetypes.guess_type(path)[0],
+    )
+
+
 @final
 class LocalFile(File):
     _adapter: "LocalAdapter"
 
-    def __init__(self, path: str, adapter: "LocalAdapter") -> None:
-        super().__init__(path)
+    def __init__(
+        self,
+        path: str,
+        adapter: "LocalAdapter",
+        metadata: FileMetadata | None = None,
+    ) -> None:
+        super().__init__(path, metadata)
         self._adapter = adapter
 
-    @property
-    async def size(self) -> int:
-        return await getsize(self._path)
+    async def _load_metadata(self) -> FileMetadata:
+        return await self._adapter.get_metadata(self._path)
 
     async def read(self) -> bytes:
         return await self._adapter.read(self._path)
 
-    async def get_iterator(self) -> AsyncIterator[bytes]:
-        return await self._adapter.get_iterator(self._path)
+    async def read_range(self, offset: int, length: int | None = None) -> bytes:
+        return await self._adapter.read_range(self._path, offset, length)
+
+    async def get_iterator(
+        self, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(self._path, chunk_size, read_ahead)
+
+    def open_mmap(self) -> AbstractAsyncContextManager[memoryview]:
+        return self._adapter.open_mmap(self._path)
+
+    async def get_view_iterator(
+        self, chunk_size: int = 1024 * 1024
+    ) -> AsyncIterator[memoryview]:
+        return await self._adapter.get_view_iterator(self._path, chunk_size)
+
+    async def sendfile(self, writer: asyncio.StreamWriter) -> int:
+        return await self._adapter.sendfile(self._path, writer)
 
     async def write(self, data: bytes) -> None:
         await self._adapter.write(self._path, data)
+        self._metadata = None
 
     async def delete(self) -> None:
         await self._adapter.delete(self._path)
 
 
+def _join(path: str, name: str) -> str:
+    """The empty path is the current directory, its entries are named without a prefix."""
+    if path == "" or path.endswith("/"):
+        return f"{path}{name}"
+
+    return f"{path}/{name}"
+
+
+def _to_item(
+    path: str, entry: os.DirEntry[str], adapter: "LocalAdapter"
+) -> _FilesystemItem:
+    if entry.is_dir():
+        return Directory(_join(path, entry.name))
+
+    return _to_file(path, entry, adapter)
+
+
+def _to_file(path: str, entry: os.DirEntry[str], adapter: "LocalAdapter") -> LocalFile:
+    filepath = _join(path, entry.name)
+    try:
+        stat_result = entry.stat()
+    except FileNotFoundError:
+        # A dangling symbolic link, it has no target to describe.
+        return LocalFile(filepath, adapter)
+
+    return LocalFile(filepath, adapter, _to_metadata(filepath, stat_result))
+
+
+def _scandir(path: str, adapter: "LocalAdapter") -> list[_FilesystemItem]:
+    """Reads the whole directory in a single executor call, the entries tell files from
+    directories without another system call and provide the stat result for the metadata.
+    """
+    with os.scandir(path or ".") as entries:
+        return [_to_item(path, entry, adapter) for entry in entries]
+
+
+_TRANSFER_SIZE = 64 * 1024 * 1024
+# The kernel can not transfer between these files, the data is copied in user space instead.
+_UNSUPPORTED_TRANSFER = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+
+
+def _transfer(source: int, destination: int) -> None:
+    """Transfers the data from the current position of the source to the destination within
+    the kernel where possible, preferring copy_file_range which lets filesystems share the
+    data blocks instead of copying them."""
+    if hasattr(os, "copy_file_range"):
+        try:
+            while os.copy_file_range(source, destination, _TRANSFER_SIZE):
+                pass
+            return
+        except OSError as error:
+            if error.errno not in _UNSUPPORTED_TRANSFER:
+                raise
+
+    if sys.platform == "linux":
+        try:
+            while os.sendfile(destination, source, None, _TRANSFER_SIZE):
+                pass
+            return
+        except OSError as error:
+            if error.errno not in _UNSUPPORTED_TRANSFER:
+                raise
+
+    while chunk := os.read(source, 1024 * 1024):
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(destination, view) :]
+
+
+def _copy(source: str, destination: str) -> None:
+    with open(source, "rb") as source_file:
+        # Opening the destination would truncate the source when both are the same file.
+        try:
+            destination_stat = os.stat(destination)
+        except FileNotFoundError:
+            pass
+        else:
+            source_stat = os.fstat(source_file.fileno())
+            if (source_stat.st_dev, source_stat.st_ino) == (
+                destination_stat.st_dev,
+                destination_stat.st_ino,
+            ):
+                raise shutil.SameFileError(
+                    f"Failed to copy file '{source}' to '{destination}', they are the same file!"
+                )
+
+        with open(destination, "wb") as destination_file:
+            _transfer(source_file.fileno(), destination_file.fileno())
+
+
+def _write_from_file_descriptor(path: str, source: int) -> None:
+    with open(path, "wb") as file:
+        _transfer(source, file.fileno())
+
+
+@final
+class FileDescriptorSource:
+    """Iterates over the data of an open file descriptor, from its current position. Passed
+    to write_iterator of a LocalAdapter the data is transferred within the kernel, other
+    adapters read it in chunks. The file descriptor is not closed."""
+
+    _file_descriptor: int
+    _chunk_size: int
+
+    def __init__(self, file_descriptor: int, chunk_size: int = 1024 * 1024) -> None:
+        _check_chunks(chunk_size)
+        self._file_descriptor = file_descriptor
+        self._chunk_size = chunk_size
+
+    @property
+    def file_descriptor(self) -> int:
+        return self._file_descriptor
+
+    def __aiter__(self) -> "FileDescriptorSource":
+        return self
+
+    async def __anext__(self) -> bytes:
+        chunk = await asyncio.get_running_loop().run_in_executor(
+            None, os.read, self._file_descriptor, self._chunk_size
+        )
+        if not chunk:
+            raise StopAsyncIteration
+
+        return chunk
+
+
+def _map(path: str) -> mmap.mmap | None:
+    _check_file(path)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # An empty file can not be mapped.
+            return None
+
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _check_file(path: str) -> None:
+    """Only regular files are found, other files like directories or pipes are not."""
+    if not stat_module.S_ISREG(os.stat(path).st_mode):
+        raise FileNotFoundError(path)
+
+
+def _open_for_reading(path: str) -> io.FileIO:
+    """Opens a regular file without buffering."""
+    _check_file(path)
+
+    return io.FileIO(path)
+
+
+def _check_directory(path: str) -> None:
+    """Raises like scandir does, without opening the directory."""
+    if not stat_module.S_ISDIR(os.stat(path).st_mode):
+        raise NotADirectoryError(errno.ENOTDIR, os.strerror(errno.ENOTDIR), path)
+
+
+def _open_for_writing(path: str) -> BinaryIO:
+    return open(path, "wb")
+
+
+def _read_file(path: str, offset: int = 0, length: int | None = None) -> bytes:
+    with open(path, "rb") as file:
+        file.seek(offset)
+        return file.read(-1 if length is None else length)
+
+
+def _write_file(path: str, data: bytes) -> None:
+    with open(path, "wb") as file:
+        file.write(data)
+
+
+_LISTING_BATCH_SIZE = 1000
+
+
+def _read_batch(
+    path: str, entries: Iterator[os.DirEntry[str]], adapter: "LocalAdapter"
+) -> list[_FilesystemItem]:
+    return [
+        _to_item(path, entry, adapter) for entry in islice(entries, _LISTING_BATCH_SIZE)
+    ]
+
+
+def _scan_tree_level(
+    path: str, name_prefix: str, adapter: "LocalAdapter"
+) -> tuple[list[File], list[str]]:
+    """Reads one directory of a walk, symbolic links to directories are not followed
+    to avoid walking in circles."""
+    files: list[File] = []
+    directories: list[str] = []
+    with os.scandir(path or ".") as entries:
+        for entry in entries:
+            if not entry.name.startswith(name_prefix):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                directories.append(_join(path, entry.name))
+            elif not entry.is_dir():
+                files.append(_to_file(path, entry, adapter))
+
+    return files, directories
+
+
 @final
 class LocalAdapter(Adapter):
+    _walk_concurrency: int
+    _executor: Executor | None
+
+    def __init__(
+        self, walk_concurrency: int = 8, executor: Executor | None = None
+    ) -> None:
+        """Every operation runs as a single call in the executor, except for the reads and
+        writes of each chunk when iterating. Without an executor the default executor of the
+        event loop is used, pass a dedicated thread pool to size it for the workload."""
+        self._walk_concurrency = walk_concurrency
+        self._executor = executor
+
+    async def _run[**P, T](
+        self, function: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+    ) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, partial(function, *args, **kwargs)
+        )
+
     async def list(self, path: str) -> DirectoryListing:
         try:
-            contents = await listdir(path)
+            items: list[_FilesystemItem] = await self._run(_scandir, path, self)
         except FileNotFoundError as error:
             raise NotFoundException(
                 f"Failed to retrieve directory listing for '{path}'!"
             ) from error
 
-        items: list[_FilesystemItem] = []
-        for item in contents:
-            filepath = f"{path}/{item}"
-            if await isdir(filepath):
-                items.append(Directory(filepath))
-            else:
-                items.append(LocalFile(filepath, self))
-
         return items
 
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        """The directory is opened once the iteration starts, an iterator that is never
+        consumed holds no file descriptor."""
+        try:
+            await self._run(_check_directory, path or ".")
+        except FileNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to retrieve directory listing for '{path}'!"
+            ) from error
+
+        async def iterate() -> AsyncIterator[_FilesystemItem]:
+            try:
+                entries = await self._run(os.scandir, path or ".")
+            except FileNotFoundError as error:
+                raise NotFoundException(
+                    f"Failed to retrieve directory listing for '{path}'!"
+                ) from error
+
+            with entries:
+                while batch := await self._run(_read_batch, path, entries, self):
+                    for item in batch:
+                        yield item
+
+        return iterate()
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        try:
+            files, directories = await self._run(
+                _scan_tree_level, path, name_prefix, self
+            )
+        except FileNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to retrieve directory listing for '{path}'!"
+            ) from error
+
+        semaphore = asyncio.Semaphore(self._walk_concurrency)
+
+        async def scan(directory: str) -> tuple[list[File], list[str]]:
+            async with semaphore:
+                try:
+                    return await self._run(_scan_tree_level, directory, "", self)
+                except FileNotFoundError:
+                    # The directory was removed while walking.
+                    return [], []
+
+        async def iterate() -> AsyncIterator[File]:
+            tasks = {asyncio.create_task(scan(directory)) for directory in directories}
+            try:
+                for file in files:
+                    yield file
+
+                while tasks:
+                    done, tasks = await asyncio.wait(
+                        tasks, return_when=asyncio.FIRST_COMPLETED
+                    )
+                    for task in done:
+                        task_files, task_directories = task.result()
+                        tasks.update(
+                            asyncio.create_task(scan(directory))
+                            for directory in task_directories
+                        )
+                        for file in task_files:
+                            yield file
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+        return iterate()
+
     async def read(self, path: str) -> bytes:
         try:
-            async with aiofiles.open(path, mode="rb") as file:
-                data = await file.read()
+            return await self._run(_read_file, path)
         except FileNotFoundError as error:
             raise NotFoundException(f"Failed to find file '{path}'!") from error
 
-        return data
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        _check_range(offset, length)
+        if length == 0:
+            return b""
 
-    async def get_iterator(self, path: str) -> AsyncIterator[bytes]:
-        if not await exists(path) or not await isfile(path):
-            raise NotFoundException(f"Failed to find file '{path}'!")
+        try:
+            return await self._run(_read_file, path, offset, length)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+    async def _open_file(self, path: str) -> io.FileIO:
+        try:
+            return await self._run(_open_for_reading, path)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        """The file is opened once the iteration starts, an iterator that is never consumed
+        holds no file descriptor."""
+        _check_chunks(chunk_size, read_ahead)
+        try:
+            await self._run(_check_file, path)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+        size = chunk_size or 1024 * 1024  # 1MB chunks by default
 
         async def iterate() -> AsyncIterator[bytes]:
-            async with aiofiles.open(path, mode="rb") as file:
-                while chunk := await file.read(1024 * 1024):  # 1MB chunks
+            file = await self._open_file(path)
+            try:
+                while chunk := await self._run(file.read, size):
                     yield chunk
+            finally:
+                await self._run(file.close)
+
+        return _read_ahead(iterate(), read_ahead) if read_ahead else iterate()
+
+    @asynccontextmanager
+    async def open_mmap(self, path: str) -> AsyncGenerator[memoryview, None]:
+        """Maps the file into memory instead of reading it, the view is only valid within the
+        context. Views sliced from it keep the file mapped until they are garbage collected,
+        release them to unmap it right away. Pages are loaded from disk when the view is
+        accessed, which blocks the event loop if they are not in the page cache yet."""
+        try:
+            mapped = await self._run(_map, path)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+        if mapped is None:
+            yield memoryview(b"")
+            return
+
+        view = memoryview(mapped)
+        try:
+            yield view
+        finally:
+            view.release()
+            try:
+                mapped.close()
+            except BufferError:
+                """A slice of the view is still in use, it unmaps the file once it is gone."""
+
+    async def get_view_iterator(
+        self, path: str, chunk_size: int = 1024 * 1024
+    ) -> AsyncIterator[memoryview]:
+        """Reads the file in chunks into a single reused buffer. Each chunk is only valid until
+        the next chunk is read, copy it with bytes() to keep it. Like get_iterator, the file
+        is opened once the iteration starts."""
+        _check_chunks(chunk_size)
+        try:
+            await self._run(_check_file, path)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+        async def iterate() -> AsyncIterator[memoryview]:
+            file = await self._open_file(path)
+            buffer = memoryview(bytearray(chunk_size))
+            try:
+                while read := await self._run(file.readinto, buffer):
+                    yield buffer[:read]
+            finally:
+                await self._run(file.close)
 
         return iterate()
 
+    async def sendfile(self, path: str, writer: asyncio.StreamWriter) -> int:
+        """Sends the file to the stream, like a socket connection, without copying the data
+        through Python where the transport allows it. Returns the number of bytes sent.
+        """
+        with await self._open_file(path) as file:
+            await writer.drain()
+            return await asyncio.get_running_loop().sendfile(writer.transport, file)
+
     async def get_file(self, path: str) -> LocalFile:
-        if await exists(path) and await isfile(path):
-            return LocalFile(path, self)
+        return LocalFile(path, self, await self.get_metadata(path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        try:
+            stat_result = await self._run(os.stat, path)
+        except FileNotFoundError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+        if not stat_module.S_ISREG(stat_result.st_mode):
+            raise NotFoundException(f"Failed to find file '{path}'!")
 
-        raise NotFoundException(f"Failed to find file '{path}'!")
+        return _to_metadata(path, stat_result)
 
     async def write(self, path: str, data: bytes) -> LocalFile:
         try:
-            async with aiofiles.open(path, mode="wb") as file:
-                await file.write(data)
+            await self._run(_write_file, path, data)
         except FileNotFoundError as error:
             raise NotFoundException(
                 f"Failed to write file '{path}', directory does not exist!"
@@ -100,23 +517,66 @@ class LocalAdapter(Adapter):
         self, path: str, iterator: AsyncIterator[bytes]
     ) -> LocalFile:
         try:
-            async with aiofiles.open(path, mode="wb") as file:
-                async for chunk in iterator:
-                    await file.write(chunk)
+            if isinstance(iterator, FileDescriptorSource):
+                await self._run(
+                    _write_from_file_descriptor, path, iterator.file_descriptor
+                )
+                return LocalFile(path, self)
+
+            file = await self._run(_open_for_writing, path)
         except FileNotFoundError as error:
             raise NotFoundException(
                 f"Failed to write file '{path}', directory does not exist!"
             ) from error
 
+        try:
+            async for chunk in iterator:
+                await self._run(file.write, chunk)
+        finally:
+            await self._run(file.close)
+
         return LocalFile(path, self)
 
+    async def copy(self, source: str, destination: str) -> LocalFile:
+        """The data is copied within the kernel where the platform allows it."""
+        try:
+            await self._run(_copy, source, destination)
+        except FileNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to copy file '{source}' to '{destination}', file or directory does not exist!"
+            ) from error
+
+        return LocalFile(destination, self)
+
+    async def move(self, source: str, destination: str) -> LocalFile:
+        try:
+            await self._run(os.replace, source, destination)
+        except FileNotFoundError as error:
+            raise NotFoundException(
+                f"Failed to move file '{source}' to '{destination}', file or directory does not exist!"
+            ) from error
+        except OSError as error:
+            # Renaming is not possible across filesystems.
+            if error.errno != errno.EXDEV:
+                raise
+
+            await self.copy(source, destination)
+            await self.delete(source)
+
+        return LocalFile(destination, self)
+
     async def makedirs(self, path: str) -> None:
-        await makedirs(path)
+        await self._run(os.makedirs, path)
 
     async def delete(self, path: str) -> None:
         try:
-            await remove(path)
+            await self._run(os.remove, path)
         except FileNotFoundError as error:
             raise NotFoundException(
                 f"Failed to delete file '{path}', file does not exist!"
             ) from error
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        return await _map_paths(paths, self.delete, max_concurrency)
@@ -0,0 +1,310 @@
+import mimetypes
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from datetime import datetime, timezone
+from typing import AsyncIterator, final
+
+from plugfs.filesystem import (
+    Adapter,
+    Directory,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _check_chunks,
+    _check_range,
+    _FilesystemItem,
+)
+
+
+class CapacityExceededException(Exception): ...
+
+
+def _directory_prefix(path: str) -> str:
+    return path if path == "" or path.endswith("/") else f"{path}/"
+
+
+@final
+class MemoryFile(File):
+    _adapter: "MemoryAdapter"
+
+    def __init__(
+        self,
+        path: str,
+        adapter: "MemoryAdapter",
+        metadata: FileMetadata | None = None,
+    ) -> None:
+        super().__init__(path, metadata)
+        self._adapter = adapter
+
+    async def _load_metadata(self) -> FileMetadata:
+        return await self._adapter.get_metadata(self._path)
+
+    async def read(self) -> bytes:
+        return await self._adapter.read(self._path)
+
+    async def read_range(self, offset: int, length: int | None = None) -> bytes:
+        return await self._adapter.read_range(self._path, offset, length)
+
+    async def read_view(self, offset: int = 0, length: int | None = None) -> memoryview:
+        return await self._adapter.read_view(self._path, offset, length)
+
+    async def get_iterator(
+        self, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(self._path, chunk_size, read_ahead)
+
+    async def get_view_iterator(
+        self, chunk_size: int = 1024 * 1024
+    ) -> AsyncIterator[memoryview]:
+        return await self._adapter.get_view_iterator(self._path, chunk_size)
+
+    async def delete(self) -> None:
+        await self._adapter.delete(self._path)
+
+
+@final
+class MemoryAdapter(Adapter):
+    """Keeps the files in memory, for tests and as fast scratch storage between the stages of
+    a pipeline. Like blob storage, directories only exist as the prefixes of the paths of
+    their files, so makedirs has nothing to do and listing a missing directory is empty.
+
+    The paths are kept in a sorted index, listing a directory only visits its own entries.
+    The data of a file is immutable once written, views on it stay valid after the file is
+    overwritten or deleted. With a max size, writes that would store more bytes in total
+    raise a CapacityExceededException."""
+
+    _files: dict[str, tuple[FileMetadata, bytes]]
+    _paths: list[str]
+    _size: int
+    _max_size: int | None
+    _generation: int
+
+    def __init__(self, max_size: int | None = None) -> None:
+        self._files = {}
+        self._paths = []
+        self._size = 0
+        self._max_size = max_size
+        self._generation = 0
+
+    @property
+    def size(self) -> int:
+        """The number of bytes stored."""
+        return self._size
+
+    def _get(self, path: str) -> tuple[FileMetadata, bytes]:
+        try:
+            return self._files[path]
+        except KeyError as error:
+            raise NotFoundException(f"Failed to find file '{path}'!") from error
+
+    def _reserve(self, path: str, size: int) -> None:
+        if self._max_size is None:
+            return
+
+        existing = self._files.get(path)
+        available = self._max_size - self._size
+        if existing is not None:
+            available += existing[0].size
+
+        if size > available:
+            raise CapacityExceededException(
+                f"Failed to write file '{path}', {size} bytes exceed the {available} bytes available!"
+            )
+
+    def _store(self, path: str, data: bytes) -> MemoryFile:
+        self._reserve(path, len(data))
+        self._generation += 1
+        metadata = FileMetadata(
+            size=len(data),
+            last_modified=datetime.now(timezone.utc),
+            etag=f"{self._generation:x}",
+            content_type=mimetypes.guess_type(path)[0],
+        )
+
+        existing = self._files.get(path)
+        if existing is None:
+            insort(self._paths, path)
+        else:
+            self._size -= existing[0].size
+
+        self._files[path] = (metadata, data)
+        self._size += len(data)
+
+        return MemoryFile(path, self, metadata)
+
+    def _remove(self, path: str) -> bytes:
+        metadata, data = self._files.pop(path)
+        del self._paths[bisect_left(self._paths, path)]
+        self._size -= metadata.size
+
+        return data
+
+    def _items(self, path: str) -> list[_FilesystemItem]:
+        prefix = _directory_prefix(path)
+        items: list[_FilesystemItem] = []
+        index = bisect_left(self._paths, prefix)
+        while index < len(self._paths) and self._paths[index].startswith(prefix):
+            name, separator, _ = self._paths[index][len(prefix) :].partition("/")
+            if not separator:
+                file_path = self._paths[index]
+                items.append(MemoryFile(file_path, self, self._files[file_path][0]))
+                index += 1
+                continue
+
+            # A path with a leading slash in the empty path has no directory name.
+            if name:
+                items.append(Directory(f"{prefix}{name}"))
+            # Skip the rest of the directory, "0" sorts right after "/".
+            index = bisect_left(self._paths, f"{prefix}{name}0", index)
+
+        return items
+
+    async def list(self, path: str) -> DirectoryListing:
+        return self._items(path)
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        items = self._items(path)
+
+        async def iterate() -> AsyncIterator[_FilesystemItem]:
+            for item in items:
+                yield item
+
+        return iterate()
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        prefix = f"{_directory_prefix(path)}{name_prefix}"
+        start = bisect_left(self._paths, prefix)
+        end = start
+        while end < len(self._paths) and self._paths[end].startswith(prefix):
+            end += 1
+        files = [
+            MemoryFile(file_path, self, self._files[file_path][0])
+            for file_path in self._paths[start:end]
+        ]
+
+        async def iterate() -> AsyncIterator[File]:
+            for file in files:
+                yield file
+
+        return iterate()
+
+    async def read(self, path: str) -> bytes:
+        return self._get(path)[1]
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        _check_range(offset, length)
+        if length == 0:
+            return b""
+
+        data = self._get(path)[1]
+
+        return data[offset:] if length is None else data[offset : offset + length]
+
+    async def read_view(
+        self, path: str, offset: int = 0, length: int | None = None
+    ) -> memoryview:
+        """Like read_range, without copying the data."""
+        _check_range(offset, length)
+        view = memoryview(self._get(path)[1])
+
+        return view[offset:] if length is None else view[offset : offset + length]
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        """The data is in memory already, there is nothing to read ahead."""
+        _check_chunks(chunk_size, read_ahead)
+        data = self._get(path)[1]
+        size = chunk_size or 1024 * 1024  # 1MB chunks by default
+
+        async def iterate() -> AsyncIterator[bytes]:
+            for offset in range(0, len(data), size):
+                yield data[offset : offset + size]
+
+        return iterate()
+
+    async def get_view_iterator(
+        self, path: str, chunk_size: int = 1024 * 1024
+    ) -> AsyncIterator[memoryview]:
+        _check_chunks(chunk_size)
+        view = memoryview(self._get(path)[1])
+
+        async def iterate() -> AsyncIterator[memoryview]:
+            for offset in range(0, len(view), chunk_size):
+                yield view[offset : offset + chunk_size]
+
+        return iterate()
+
+    async def get_file(self, path: str) -> MemoryFile:
+        return MemoryFile(path, self, self._get(path)[0])
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return self._get(path)[0]
+
+    async def write(self, path: str, data: bytes) -> MemoryFile:
+        return self._store(path, bytes(data))
+
+    async def write_iterator(
+        self, path: str, iterator: AsyncIterator[bytes]
+    ) -> MemoryFile:
+        chunks = []
+        size = 0
+        async for chunk in iterator:
+            size += len(chunk)
+            # Fail before the whole iterator has been buffered.
+            self._reserve(path, size)
+            chunks.append(chunk)
+
+        return self._store(path, b"".join(chunks))
+
+    async def copy(self, source: str, destination: str) -> MemoryFile:
+        """The copy shares the data of the source, it only counts against the max size."""
+        try:
+            data = self._files[source][1]
+        except KeyError as error:
+            raise NotFoundException(
+                f"Failed to copy file '{source}' to '{destination}', file does not exist!"
+            ) from error
+
+        return self._store(destination, data)
+
+    async def move(self, source: str, destination: str) -> MemoryFile:
+        if source not in self._files:
+            raise NotFoundException(
+                f"Failed to move file '{source}' to '{destination}', file does not exist!"
+            )
+
+        if source == destination:
+            return MemoryFile(destination, self, self._files[source][0])
+
+        data = self._remove(source)
+
+        return self._store(destination, data)
+
+    async def makedirs(self, path: str) -> None:
+        """Directories only exist as the prefixes of the paths of their files."""
+
+    async def delete(self, path: str) -> None:
+        if path not in self._files:
+            raise NotFoundException(
+                f"Failed to delete file '{path}', file does not exist!"
+            )
+
+        self._remove(path)
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        results: list[NotFoundException | None] = []
+        for path in paths:
+            try:
+                await self.delete(path)
+            except NotFoundException as exception:
+                results.append(exception)
+            else:
+                results.append(None)
+
+        return results
@@ -0,0 +1,250 @@
+import asyncio
+import random
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from functools import partial
+from typing import final
+
+from azure.core.exceptions import (
+    HttpResponseError,
+    ServiceRequestError,
+    ServiceResponseError,
+)
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _FilesystemItem,
+)
+from plugfs.wrapper import WrappingAdapter
+
+
+def _retry_after(exception: Exception) -> float | None:
+    """The number of seconds the service asked to wait before retrying, if it did."""
+    if not isinstance(exception, HttpResponseError) or exception.response is None:
+        return None
+
+    # Not every response type of azure-core declares its headers.
+    response_headers: Mapping[str, str] = getattr(exception.response, "headers", {})
+    headers = {name.lower(): value for name, value in response_headers.items()}
+    for name in ["retry-after-ms", "x-ms-retry-after-ms"]:
+        if name in headers:
+            try:
+                return max(float(headers[name]) / 1000, 0.0)
+            except ValueError:
+                pass
+
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+@final
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retries failed attempts up to attempts in total, waiting a random time up to the
+    exponential backoff of base delay, doubled every attempt and capped at max delay. When
+    the service asks to wait longer with a Retry-After header, that wait is used instead,
+    unless it is longer than max delay, then the error is raised right away.
+
+    Responses with one of the statuses, connection errors and timeouts are retried. A file
+    that is not found is never retried."""
+
+    attempts: int = 4
+    base_delay: float = 0.1
+    max_delay: float = 20.0
+    statuses: frozenset[int] = frozenset({408, 429, 500, 502, 503, 504})
+
+    def is_retryable(self, exception: Exception) -> bool:
+        if isinstance(exception, HttpResponseError):
+            return exception.status_code in self.statuses
+
+        return isinstance(
+            exception,
+            (ServiceRequestError, ServiceResponseError, ConnectionError, TimeoutError),
+        )
+
+    def delay(self, exception: Exception, attempt: int) -> float | None:
+        """The seconds to wait after the given failed attempt, counting from 1, or None when
+        the exception is to be raised."""
+        if attempt >= self.attempts or not self.is_retryable(exception):
+            return None
+
+        backoff = random.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+        retry_after = _retry_after(exception)
+        if retry_after is None:
+            return backoff
+
+        if retry_after > self.max_delay:
+            return None
+
+        return max(backoff, retry_after)
+
+
+@final
+@dataclass(frozen=True)
+class RetryStatistics:
+    """Hedges counts the duplicate requests that were sent, hedge wins the ones that
+    responded first."""
+
+    retries: int
+    hedges: int
+    hedge_wins: int
+
+
+@final
+class RetryingAdapter(WrappingAdapter):
+    """Retries operations of the wrapped adapter that failed on throttling or on a transient
+    error, following the retry policy. Moves and writes of an iterator are not retried, they
+    can not be repeated safely. Iterators are retried until they are returned, errors while
+    they are consumed are raised.
+
+    With hedge after, a read, read range, file or metadata lookup that did not complete
+    within hedge after seconds is sent a second time. The first successful response is
+    used and the other request is cancelled, which trims the slowest requests at the cost of
+    a few duplicate ones."""
+
+    _policy: RetryPolicy
+    _hedge_after: float | None
+    _retries: int
+    _hedges: int
+    _hedge_wins: int
+
+    def __init__(
+        self,
+        adapter: Adapter,
+        policy: RetryPolicy | None = None,
+        hedge_after: float | None = None,
+    ) -> None:
+        super().__init__(adapter)
+        self._policy = RetryPolicy() if policy is None else policy
+        self._hedge_after = hedge_after
+        self._retries = 0
+        self._hedges = 0
+        self._hedge_wins = 0
+
+    @property
+    def statistics(self) -> RetryStatistics:
+        return RetryStatistics(
+            retries=self._retries, hedges=self._hedges, hedge_wins=self._hedge_wins
+        )
+
+    async def _retry[T](self, operation: Callable[[], Awaitable[T]]) -> T:
+        attempt = 1
+        while True:
+            try:
+                return await operation()
+            except Exception as exception:
+                delay = self._policy.delay(exception, attempt)
+                if delay is None:
+                    raise
+
+            self._retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def _hedge[T](self, operation: Callable[[], Awaitable[T]]) -> T:
+        if self._hedge_after is None:
+            return await operation()
+
+        first = asyncio.ensure_future(operation())
+        tasks = [first]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_after)
+            if done:
+                return first.result()
+
+            self._hedges += 1
+            tasks.append(asyncio.ensure_future(operation()))
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._hedge_wins += 1
+
+                        return task.result()
+
+            # Both failed, the error of the first request is raised.
+            return first.result()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # Retrieve the exception of a request that lost the race.
+                    task.exception()
+
+    async def _retry_hedged[T](self, operation: Callable[[], Awaitable[T]]) -> T:
+        return await self._retry(partial(self._hedge, operation))
+
+    async def list(self, path: str) -> DirectoryListing:
+        return await self._retry(partial(super().list, path))
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        return await self._retry(partial(super().iter_list, path))
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        return await self._retry(partial(super().walk, path, name_prefix))
+
+    async def read(self, path: str) -> bytes:
+        return await self._retry_hedged(partial(super().read, path))
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._retry_hedged(
+            partial(super().read_range, path, offset, length)
+        )
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._retry(
+            partial(super().get_iterator, path, chunk_size, read_ahead)
+        )
+
+    async def get_file(self, path: str) -> File:
+        return await self._retry_hedged(partial(super().get_file, path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await self._retry_hedged(partial(super().get_metadata, path))
+
+    async def write(self, path: str, data: bytes) -> File:
+        return await self._retry(partial(super().write, path, data))
+
+    async def copy(self, source: str, destination: str) -> File:
+        return await self._retry(partial(super().copy, source, destination))
+
+    async def makedirs(self, path: str) -> None:
+        await self._retry(partial(super().makedirs, path))
+
+    async def delete(self, path: str) -> None:
+        await self._retry(partial(super().delete, path))
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        return await self._retry(partial(super().delete_many, paths, max_concurrency))
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import posixpath
+from collections.abc import Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Literal, final
+
+from plugfs.filesystem import (
+    File,
+    FileMetadata,
+    Filesystem,
+    NotFoundException,
+    _map_paths,
+)
+
+Comparison = Literal["size", "mtime", "checksum"]
+
+
+@final
+@dataclass(frozen=True)
+class SyncResult:
+    """The paths are relative to the synchronised directories."""
+
+    copied: Sequence[str]
+    deleted: Sequence[str]
+    unchanged: Sequence[str]
+
+
+async def _index(filesystem: Filesystem, path: str) -> dict[str, File]:
+    files = await filesystem.walk(path)
+
+    return {file.path[len(path) :].lstrip("/"): file async for file in files}
+
+
+async def _metadata(file: File) -> FileMetadata | None:
+    try:
+        return await file.metadata
+    except NotFoundException:
+        # Removed since it was listed, or a dangling symbolic link.
+        return None
+
+
+async def _checksum(file: File) -> bytes:
+    digest = hashlib.sha256()
+    async for chunk in await file.get_iterator():
+        digest.update(chunk)
+
+    return digest.digest()
+
+
+async def _is_changed(source: File, destination: File, comparison: Comparison) -> bool:
+    source_metadata = await _metadata(source)
+    destination_metadata = await _metadata(destination)
+    if source_metadata is None or destination_metadata is None:
+        return True
+
+    if source_metadata.size != destination_metadata.size:
+        return True
+
+    if comparison == "size":
+        return False
+
+    if comparison == "checksum":
+        return await _checksum(source) != await _checksum(destination)
+
+    # Etags are specific to a backend, a copy has a different etag than its source. The
+    # destination is written after the source, so it is only older when the source changed.
+    if (
+        source_metadata.last_modified is None
+        or destination_metadata.last_modified is None
+    ):
+        return True
+
+    return source_metadata.last_modified > destination_metadata.last_modified
+
+
+async def sync(
+    source: Filesystem,
+    source_path: str,
+    destination: Filesystem,
+    destination_path: str,
+    comparison: Comparison = "mtime",
+    delete: bool = False,
+    dry_run: bool = False,
+    max_concurrency: int = 16,
+) -> SyncResult:
+    """Copies the files of the source directory tree that are missing or changed in the
+    destination directory tree. Files only found in the destination are deleted when delete
+    is set. In a dry run the result tells what would be done, without changing anything.
+
+    A file is changed when its size differs, and depending on the comparison when the source
+    was modified after the destination or when the contents have a different checksum. The
+    checksum comparison reads both files entirely."""
+    source_files = await _index(source, source_path)
+    try:
+        destination_files = await _index(destination, destination_path)
+    except NotFoundException:
+        destination_files = {}
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def is_changed(path: str) -> bool:
+        if path not in destination_files:
+            return True
+
+        async with semaphore:
+            return await _is_changed(
+                source_files[path], destination_files[path], comparison
+            )
+
+    paths = sorted(source_files)
+    changes = await asyncio.gather(*(is_changed(path) for path in paths))
+    changed = [path for path, change in zip(paths, changes) if change]
+    unchanged = [path for path, change in zip(paths, changes) if not change]
+    extraneous = (
+        sorted(destination_files.keys() - source_files.keys()) if delete else []
+    )
+
+    if dry_run:
+        return SyncResult(changed, extraneous, unchanged)
+
+    def to_destination(path: str) -> str:
+        return posixpath.join(destination_path, path)
+
+    # Local directories have to exist before writing files in them.
+    for directory in sorted(
+        {posixpath.dirname(to_destination(path)) for path in changed} - {""}
+    ):
+        with suppress(FileExistsError):
+            await destination.makedirs(directory)
+
+    async def copy(path: str) -> File:
+        return await source.copy(
+            source_files[path].path, to_destination(path), destination
+        )
+
+    results = await _map_paths(changed, copy, max_concurrency)
+    # A file that was removed from the source while synchronising is not copied.
+    copied = [
+        path
+        for path, result in zip(changed, results)
+        if not isinstance(result, NotFoundException)
+    ]
+
+    deleted: list[str] = []
+    if extraneous:
+        deletions = await destination.delete_many(
+            [destination_files[path].path for path in extraneous], max_concurrency
+        )
+        deleted = [
+            path for path, deletion in zip(extraneous, deletions) if deletion is None
+        ]
+
+    return SyncResult(copied, deleted, unchanged)
@@ -0,0 +1,152 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from typing import AsyncIterator, final
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    FileMetadata,
+    NotFoundException,
+    _FilesystemItem,
+)
+
+
+@final
+class _SingleFlight[T]:
+    """Concurrent calls with the same key share a single run of the operation and its result,
+    or its exception."""
+
+    _runs: dict[str, asyncio.Future[T]]
+
+    def __init__(self) -> None:
+        self._runs = {}
+
+    async def run(self, key: str, operation: Callable[[], Awaitable[T]]) -> T:
+        run = self._runs.get(key)
+        if run is None:
+            run = asyncio.ensure_future(operation())
+            self._runs[key] = run
+            run.add_done_callback(lambda _: self._finish(key, run))
+
+        # A cancelled caller does not cancel the run the other callers wait for.
+        return await asyncio.shield(run)
+
+    def _finish(self, key: str, run: "asyncio.Future[T]") -> None:
+        if self._runs.get(key) is run:
+            del self._runs[key]
+
+        if not run.cancelled():
+            # Retrieve the exception, every caller may have been cancelled.
+            run.exception()
+
+
+@final
+class WrappedFile(File):
+    """A file of a wrapping adapter, its operations go through the wrapping adapter instead of
+    directly to the wrapped adapter."""
+
+    _adapter: Adapter
+
+    def __init__(
+        self, path: str, adapter: Adapter, metadata: FileMetadata | None = None
+    ) -> None:
+        super().__init__(path, metadata)
+        self._adapter = adapter
+
+    async def _load_metadata(self) -> FileMetadata:
+        return await self._adapter.get_metadata(self._path)
+
+    async def read(self) -> bytes:
+        return await self._adapter.read(self._path)
+
+    async def read_range(self, offset: int, length: int | None = None) -> bytes:
+        return await self._adapter.read_range(self._path, offset, length)
+
+    async def get_iterator(
+        self, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(self._path, chunk_size, read_ahead)
+
+    async def delete(self) -> None:
+        await self._adapter.delete(self._path)
+
+
+class WrappingAdapter(Adapter):
+    """Passes every operation on to the wrapped adapter, subclasses override the operations
+    they add behaviour to. Files are returned as wrapped files so operations on them go
+    through the wrapping adapter as well."""
+
+    _adapter: Adapter
+
+    def __init__(self, adapter: Adapter) -> None:
+        self._adapter = adapter
+
+    def _wrap(self, file: File) -> WrappedFile:
+        return WrappedFile(file.path, self, file._metadata)
+
+    def _wrap_item(self, item: _FilesystemItem) -> _FilesystemItem:
+        return self._wrap(item) if isinstance(item, File) else item
+
+    async def list(self, path: str) -> DirectoryListing:
+        return [self._wrap_item(item) for item in await self._adapter.list(path)]
+
+    async def iter_list(self, path: str) -> AsyncIterator[_FilesystemItem]:
+        items = await self._adapter.iter_list(path)
+
+        async def iterate() -> AsyncIterator[_FilesystemItem]:
+            async for item in items:
+                yield self._wrap_item(item)
+
+        return iterate()
+
+    async def walk(self, path: str, name_prefix: str = "") -> AsyncIterator[File]:
+        files = await self._adapter.walk(path, name_prefix)
+
+        async def iterate() -> AsyncIterator[File]:
+            async for file in files:
+                yield self._wrap(file)
+
+        return iterate()
+
+    async def read(self, path: str) -> bytes:
+        return await self._adapter.read(path)
+
+    async def read_range(
+        self, path: str, offset: int, length: int | None = None
+    ) -> bytes:
+        return await self._adapter.read_range(path, offset, length)
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(path, chunk_size, read_ahead)
+
+    async def get_file(self, path: str) -> File:
+        return self._wrap(await self._adapter.get_file(path))
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        return await self._adapter.get_metadata(path)
+
+    async def write(self, path: str, data: bytes) -> File:
+        return self._wrap(await self._adapter.write(path, data))
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        return self._wrap(await self._adapter.write_iterator(path, iterator))
+
+    async def copy(self, source: str, destination: str) -> File:
+        return self._wrap(await self._adapter.copy(source, destination))
+
+    async def move(self, source: str, destination: str) -> File:
+        return self._wrap(await self._adapter.move(source, destination))
+
+    async def makedirs(self, path: str) -> None:
+        await self._adapter.makedirs(path)
+
+    async def delete(self, path: str) -> None:
+        await self._adapter.delete(path)
+
+    async def delete_many(
+        self, paths: Sequence[str], max_concurrency: int
+    ) -> Sequence[NotFoundException | None]:
+        return await self._adapter.delete_many(paths, max_concurrency)
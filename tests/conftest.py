@@ -1,6 +1,25 @@
+import os
+import shutil
+from os import path
+from typing import AsyncGenerator
+from uuid import uuid4
+
 import pytest
 
 
 @pytest.fixture
 def anyio_backend() -> str:
     return "asyncio"
+
+
+@pytest.fixture
+async def directory() -> AsyncGenerator[str, None]:
+    directory = path.join("/tmp", str(uuid4()))
+    os.makedirs(directory)
+
+    with open(path.join(directory, "file"), "wb") as file:
+        file.write(b"Hello world!")
+
+    yield directory
+
+    shutil.rmtree(directory)
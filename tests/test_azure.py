@@ -1,3 +1,4 @@
+import asyncio
 import os
 from typing import AsyncGenerator, AsyncIterator
 
@@ -5,8 +6,9 @@ import pytest
 from azure.core.exceptions import ResourceNotFoundError
 from azure.storage.blob.aio import ContainerClient
 
-from plugfs.azure import AzureFile, AzureStorageBlobsAdapter
-from plugfs.filesystem import Directory, NotFoundException
+from plugfs.azure import AzureFile, AzureStorageBlobsAdapter, PooledTransport
+from plugfs.filesystem import Directory, Filesystem, NotFoundException
+from plugfs.local import LocalAdapter
 
 
 @pytest.fixture
@@ -130,6 +132,52 @@ class TestAzureStorageBlobsAdapter:
         items = await azure_storage_blobs_adapter.list("/this/path/does/not/exist")
         assert len(items) == 0
 
+    @pytest.mark.anyio
+    async def test_iter_list(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        iterator = await azure_storage_blobs_adapter.iter_list("/")
+        items = [item async for item in iterator]
+
+        assert [item.path for item in items] == ["/10mb.bin", "/1mb.bin", "/directory"]
+        assert isinstance(items[0], AzureFile)
+        assert isinstance(items[2], Directory)
+
+    @pytest.mark.anyio
+    async def test_walk(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        iterator = await azure_storage_blobs_adapter.walk("/directory")
+
+        assert [file.path async for file in iterator] == [
+            "/directory/256kb.bin",
+            "/directory/subdirectory/nested_file",
+        ]
+
+    @pytest.mark.anyio
+    async def test_walk_name_prefix(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        iterator = await azure_storage_blobs_adapter.walk("/directory", "sub")
+
+        assert [file.path async for file in iterator] == [
+            "/directory/subdirectory/nested_file"
+        ]
+
+    @pytest.mark.anyio
+    async def test_glob(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        filesystem = Filesystem(azure_storage_blobs_adapter)
+
+        iterator = await filesystem.glob("/**/*.bin")
+
+        assert [file.path async for file in iterator] == [
+            "/10mb.bin",
+            "/1mb.bin",
+            "/directory/256kb.bin",
+        ]
+
     @pytest.mark.anyio
     async def test_read(
         self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
@@ -150,6 +198,112 @@ class TestAzureStorageBlobsAdapter:
             == "Failed to find file '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_read_in_parallel_chunks(
+        self,
+        azure_storage_blobs_adapter: AzureStorageBlobsAdapter,
+        container_client: ContainerClient,
+    ) -> None:
+        adapter = AzureStorageBlobsAdapter(
+            container_client, max_concurrency=4, chunk_size=300 * 1024
+        )
+
+        data = await adapter.read("/10mb.bin")
+
+        assert data == await azure_storage_blobs_adapter.read("/10mb.bin")
+        assert (
+            await adapter.read_range("/10mb.bin", 1000, 1048576) == data[1000:1049576]
+        )
+
+    @pytest.mark.anyio
+    async def test_read_empty(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        await azure_storage_blobs_adapter.write("/empty", b"")
+
+        assert await azure_storage_blobs_adapter.read("/empty") == b""
+
+    @pytest.mark.anyio
+    async def test_read_with_pooled_transport(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        transport = PooledTransport(pool_size=2)
+        client = ContainerClient.from_connection_string(
+            f"DefaultEndpointsProtocol=http;AccountName={os.getenv("AZURE_ACCOUNT_NAME")};"
+            f"AccountKey={os.getenv("AZURE_ACCOUNT_KEY")};"
+            f"BlobEndpoint={os.getenv("AZURE_STORAGE_URL")}/{os.getenv("AZURE_ACCOUNT_NAME")};",
+            os.getenv("AZURE_CONTAINER", "default_container_name"),
+            transport=transport,
+        )
+
+        async with client:
+            adapter = AzureStorageBlobsAdapter(client)
+            results = await asyncio.gather(
+                *(adapter.read("/directory/256kb.bin") for _ in range(10))
+            )
+
+            assert transport.session is not None
+            assert transport.session.connector is not None
+            assert transport.session.connector.limit == 2
+
+        assert all(len(data) == 262144 for data in results)
+
+    @pytest.mark.anyio
+    async def test_read_range(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        expected = await azure_storage_blobs_adapter.read("/1mb.bin")
+
+        assert (
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", 1000, 24)
+            == expected[1000:1024]
+        )
+        assert (
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", 1048000)
+            == expected[1048000:]
+        )
+        assert (
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", 1048570, 100)
+            == expected[1048570:]
+        )
+        assert (
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", 2000000, 100)
+            == b""
+        )
+
+    @pytest.mark.anyio
+    async def test_read_range_invalid(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        assert await azure_storage_blobs_adapter.read_range("/1mb.bin", 1000, 0) == b""
+        with pytest.raises(ValueError):
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", -1, 10)
+        with pytest.raises(ValueError):
+            await azure_storage_blobs_adapter.read_range("/1mb.bin", 0, -1)
+
+    @pytest.mark.anyio
+    async def test_get_iterator_invalid(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        with pytest.raises(ValueError):
+            await azure_storage_blobs_adapter.get_iterator("/1mb.bin", chunk_size=-1)
+        with pytest.raises(ValueError):
+            await azure_storage_blobs_adapter.get_iterator("/1mb.bin", read_ahead=-1)
+
+    @pytest.mark.anyio
+    async def test_read_range_non_existing(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        with pytest.raises(NotFoundException) as exception_info:
+            await azure_storage_blobs_adapter.read_range(
+                "/this/path/does/not/exist", 0, 10
+            )
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
     @pytest.mark.anyio
     async def test_get_iterator(
         self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
@@ -170,6 +324,29 @@ class TestAzureStorageBlobsAdapter:
         assert len(data) == 10485760
         assert count == 3
 
+    @pytest.mark.anyio
+    async def test_get_iterator_read_ahead(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        iterator = await azure_storage_blobs_adapter.get_iterator(
+            "/1mb.bin", chunk_size=300 * 1024, read_ahead=2
+        )
+
+        chunks = [chunk async for chunk in iterator]
+
+        assert [len(chunk) for chunk in chunks] == [307200, 307200, 307200, 126976]
+        assert b"".join(chunks) == await azure_storage_blobs_adapter.read("/1mb.bin")
+
+    @pytest.mark.anyio
+    async def test_get_iterator_empty(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        await azure_storage_blobs_adapter.write("/empty", b"")
+
+        iterator = await azure_storage_blobs_adapter.get_iterator("/empty")
+
+        assert [chunk async for chunk in iterator] == []
+
     @pytest.mark.anyio
     async def test_get_iterator_non_existing(
         self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
@@ -202,6 +379,80 @@ class TestAzureStorageBlobsAdapter:
             == "Failed to find file '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_get_size(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        assert await azure_storage_blobs_adapter.get_size("/1mb.bin") == 1048576
+
+    @pytest.mark.anyio
+    async def test_get_size_non_existing(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        with pytest.raises(NotFoundException) as exception_info:
+            await azure_storage_blobs_adapter.get_size("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_get_properties(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        properties = await azure_storage_blobs_adapter.get_properties("/1mb.bin")
+
+        assert properties.size == 1048576
+        assert properties.etag
+        assert properties.last_modified is not None
+        assert properties.content_settings.content_type == "application/octet-stream"
+
+    @pytest.mark.anyio
+    async def test_get_metadata(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        metadata = await azure_storage_blobs_adapter.get_metadata("/1mb.bin")
+        properties = await azure_storage_blobs_adapter.get_properties("/1mb.bin")
+
+        assert metadata.size == 1048576
+        assert metadata.last_modified == properties.last_modified
+        assert metadata.etag == properties.etag
+        assert metadata.content_type == "application/octet-stream"
+
+    @pytest.mark.anyio
+    async def test_get_metadata_non_existing(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        with pytest.raises(NotFoundException) as exception_info:
+            await azure_storage_blobs_adapter.get_metadata("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_list_provides_metadata(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        items = await azure_storage_blobs_adapter.list("/")
+
+        assert isinstance(items[1], AzureFile)
+        assert await items[
+            1
+        ].metadata == await azure_storage_blobs_adapter.get_metadata("/1mb.bin")
+
+    @pytest.mark.anyio
+    async def test_list_provides_properties(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        items = await azure_storage_blobs_adapter.list("/")
+
+        assert isinstance(items[1], AzureFile)
+        properties = await azure_storage_blobs_adapter.get_properties("/1mb.bin")
+        assert (await items[1].properties).etag == properties.etag
+
     @pytest.mark.anyio
     async def test_write_new(
         self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
@@ -238,10 +489,115 @@ class TestAzureStorageBlobsAdapter:
 
         assert await file.size == 12
 
+    @pytest.mark.anyio
+    async def test_write_iterator_in_blocks(
+        self, container_client: ContainerClient
+    ) -> None:
+        adapter = AzureStorageBlobsAdapter(
+            container_client, max_concurrency=2, block_size=256 * 1024
+        )
+        data = await adapter.read("/1mb.bin")
+
+        async def iterator() -> AsyncIterator[bytes]:
+            for offset in range(0, len(data), 100 * 1024):
+                yield data[offset : offset + 100 * 1024]
+
+        file = await adapter.write_iterator("/blocks.bin", iterator())
+
+        assert await file.size == 1048576
+        assert await adapter.read("/blocks.bin") == data
+
+        blob_client = container_client.get_blob_client("/blocks.bin")
+        committed, _ = await blob_client.get_block_list()
+        assert len(committed) == 4
+
     async def _iterator(self) -> AsyncIterator[bytes]:
         for chunk in [b"Hello ", b"world", b"!"]:
             yield chunk
 
+    @pytest.mark.anyio
+    async def test_copy(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        file = await azure_storage_blobs_adapter.copy("/1mb.bin", "/copy.bin")
+
+        assert file.path == "/copy.bin"
+        assert await file.size == 1048576
+        assert await azure_storage_blobs_adapter.get_size("/1mb.bin") == 1048576
+
+    @pytest.mark.anyio
+    async def test_copy_non_existing(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        with pytest.raises(NotFoundException) as exception_info:
+            await azure_storage_blobs_adapter.copy(
+                "/this/path/does/not/exist", "/copy.bin"
+            )
+
+        assert (
+            str(exception_info.value)
+            == "Failed to copy file '/this/path/does/not/exist' to '/copy.bin', file does not exist!"
+        )
+
+    @pytest.mark.anyio
+    async def test_move(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        file = await azure_storage_blobs_adapter.move("/1mb.bin", "/moved.bin")
+
+        assert await file.size == 1048576
+
+        with pytest.raises(NotFoundException):
+            await azure_storage_blobs_adapter.get_file("/1mb.bin")
+
+    @pytest.mark.anyio
+    async def test_move_to_itself(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        file = await azure_storage_blobs_adapter.move("/1mb.bin", "/1mb.bin")
+
+        assert await file.size == 1048576
+        assert len(await azure_storage_blobs_adapter.read("/1mb.bin")) == 1048576
+
+    @pytest.mark.anyio
+    async def test_copy_from_local(
+        self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
+    ) -> None:
+        local = Filesystem(LocalAdapter())
+        source = os.path.join(
+            os.path.abspath(os.path.dirname(__file__)), "resources", "1mb.bin"
+        )
+
+        file = await local.copy(
+            source, "/from_local.bin", Filesystem(azure_storage_blobs_adapter)
+        )
+
+        assert await file.size == 1048576
+
+    @pytest.mark.anyio
+    async def test_delete_many(
+        self,
+        azure_storage_blobs_adapter: AzureStorageBlobsAdapter,
+        container_client: ContainerClient,
+    ) -> None:
+        # More blobs than fit in a single batch request.
+        paths = [f"/many/{index}" for index in range(300)]
+        await asyncio.gather(
+            *(container_client.upload_blob(path, b"Hello world!") for path in paths)
+        )
+
+        results = await azure_storage_blobs_adapter.delete_many(
+            [*paths, "/this/path/does/not/exist"], max_concurrency=2
+        )
+
+        assert results[:300] == [None] * 300
+        assert isinstance(results[300], NotFoundException)
+        assert (
+            str(results[300])
+            == "Failed to delete file '/this/path/does/not/exist', file does not exist!"
+        )
+        assert await azure_storage_blobs_adapter.list("/many") == []
+
     @pytest.mark.anyio
     async def test_delete_non_existing(
         self, azure_storage_blobs_adapter: AzureStorageBlobsAdapter
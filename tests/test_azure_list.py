@@ -1,5 +1,5 @@
 import os
-from typing import AsyncGenerator, AsyncIterator
+from typing import AsyncGenerator
 
 import pytest
 from azure.core.exceptions import ResourceNotFoundError
@@ -95,3 +95,19 @@ class TestAzureStorageBlobsAdapterList:
         assert items[0].path == "directory/subdirectory/10mb.bin"
         assert isinstance(items[1], AzureFile)
         assert items[1].path == "directory/subdirectory/1mb.bin"
+
+    @pytest.mark.anyio
+    async def test_list_keeps_lexicographic_order_of_directories_and_files(
+        self,
+        azure_storage_blobs_adapter: AzureStorageBlobsAdapter,
+        container_client: ContainerClient,
+    ) -> None:
+        # The service returns the directory prefixes of a page ahead of its blobs.
+        # Directories and files should still come back interleaved by name.
+        await container_client.upload_blob("a.bin", b"a")
+        await container_client.upload_blob("e.bin", b"e")
+
+        items = await azure_storage_blobs_adapter.list("")
+
+        assert [item.path for item in items] == ["a.bin", "directory", "e.bin"]
+        assert isinstance(items[1], Directory)
@@ -0,0 +1,411 @@
+import asyncio
+import os
+import shutil
+from os import path
+from uuid import uuid4
+
+import pytest
+
+from plugfs.caching import (
+    CachingAdapter,
+    MetadataCachingAdapter,
+    SingleFlightAdapter,
+)
+from plugfs.filesystem import Directory, File, FileMetadata, NotFoundException
+from plugfs.local import LocalAdapter
+from plugfs.memory import MemoryAdapter
+from plugfs.wrapper import WrappingAdapter
+
+
+class CountingAdapter(WrappingAdapter):
+    metadata_lookups: int = 0
+    file_lookups: int = 0
+    reads: int = 0
+
+    async def get_file(self, path: str) -> File:
+        self.file_lookups += 1
+        await asyncio.sleep(0.01)
+        return await super().get_file(path)
+
+    async def read(self, path: str) -> bytes:
+        self.reads += 1
+        await asyncio.sleep(0.01)
+        return await super().read(path)
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        self.metadata_lookups += 1
+        await asyncio.sleep(0.01)
+        return await super().get_metadata(path)
+
+
+@pytest.fixture
+def directory(directory: str) -> str:
+    """The shared directory, with a second file."""
+    with open(path.join(directory, "second"), "wb") as file:
+        file.write(b"Hello world!")
+
+    return directory
+
+
+class TestCachingAdapter:
+    @pytest.mark.anyio
+    async def test_read(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter())
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+
+        statistics = adapter.statistics
+        assert statistics.misses == 1
+        assert statistics.hits == 1
+        assert statistics.size == 12
+
+    @pytest.mark.anyio
+    async def test_file_read_uses_cache(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter())
+        await adapter.read(f"{directory}/file")
+
+        file = await adapter.get_file(f"{directory}/file")
+
+        assert await file.read() == b"Hello world!"
+        assert await file.read_range(6, 5) == b"world"
+        assert adapter.statistics.hits == 2
+
+    @pytest.mark.anyio
+    async def test_read_changed(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter())
+        await adapter.read(f"{directory}/file")
+
+        with open(path.join(directory, "file"), "wb") as file:
+            file.write(b"Hello World!")
+        os.utime(path.join(directory, "file"), ns=(0, 0))
+
+        assert await adapter.read(f"{directory}/file") == b"Hello World!"
+        assert await adapter.read(f"{directory}/file") == b"Hello World!"
+        assert adapter.statistics.misses == 2
+        assert adapter.statistics.hits == 1
+
+    @pytest.mark.anyio
+    async def test_read_without_validation(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter(), validate=False)
+        await adapter.read(f"{directory}/file")
+
+        with open(path.join(directory, "file"), "wb") as file:
+            file.write(b"Hello World!")
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+
+    @pytest.mark.anyio
+    async def test_write_invalidates(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter(), validate=False)
+        await adapter.read(f"{directory}/file")
+
+        await adapter.write(f"{directory}/file", b"Hello World!")
+
+        assert await adapter.read(f"{directory}/file") == b"Hello World!"
+        assert adapter.statistics.misses == 2
+
+    @pytest.mark.anyio
+    async def test_write_during_read(self, directory: str) -> None:
+        class SlowReadAdapter(WrappingAdapter):
+            async def read(self, path: str) -> bytes:
+                data = await super().read(path)
+                await asyncio.sleep(0.05)
+                return data
+
+        adapter = CachingAdapter(SlowReadAdapter(LocalAdapter()), validate=False)
+        read = asyncio.ensure_future(adapter.read(f"{directory}/file"))
+        await asyncio.sleep(0.01)
+
+        await adapter.write(f"{directory}/file", b"Hello World!")
+
+        assert await read == b"Hello world!"
+        assert await adapter.read(f"{directory}/file") == b"Hello World!"
+        assert adapter.statistics.hits == 0
+
+    @pytest.mark.anyio
+    async def test_write_to_other_path_during_read(self, directory: str) -> None:
+        adapter = CachingAdapter(CountingAdapter(LocalAdapter()), validate=False)
+        read = asyncio.ensure_future(adapter.read(f"{directory}/file"))
+        await asyncio.sleep(0)
+
+        await adapter.write(f"{directory}/other", b"Hello world!")
+        await read
+        await adapter.read(f"{directory}/file")
+
+        assert adapter.statistics.hits == 1
+
+    @pytest.mark.anyio
+    async def test_range_and_iterator_misses(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter())
+
+        await adapter.read_range(f"{directory}/file", 6, 5)
+        await adapter.get_iterator(f"{directory}/file")
+
+        assert adapter.statistics.misses == 2
+
+    @pytest.mark.anyio
+    async def test_delete_invalidates(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter())
+        await adapter.read(f"{directory}/file")
+
+        await adapter.delete(f"{directory}/file")
+
+        assert adapter.statistics.size == 0
+
+    @pytest.mark.anyio
+    async def test_eviction(self, directory: str) -> None:
+        adapter = CachingAdapter(LocalAdapter(), max_size=20)
+
+        await adapter.read(f"{directory}/file")
+        await adapter.read(f"{directory}/second")
+        await adapter.read(f"{directory}/file")
+
+        statistics = adapter.statistics
+        assert statistics.evictions == 2
+        assert statistics.misses == 3
+        assert statistics.size == 12
+
+    @pytest.mark.anyio
+    async def test_disk_cache(self, directory: str) -> None:
+        disk_path = path.join("/tmp", str(uuid4()))
+        adapter = CachingAdapter(
+            LocalAdapter(), max_size=20, disk_path=disk_path, disk_max_size=24
+        )
+
+        await adapter.read(f"{directory}/file")
+        await adapter.read(f"{directory}/second")
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+
+        statistics = adapter.statistics
+        assert statistics.evictions == 2
+        assert statistics.disk_hits == 1
+        assert statistics.misses == 2
+        assert statistics.disk_size == 24
+
+        shutil.rmtree(disk_path)
+
+    @pytest.mark.anyio
+    async def test_disk_cache_cleared(self, directory: str) -> None:
+        disk_path = path.join("/tmp", str(uuid4()))
+        adapter = CachingAdapter(LocalAdapter(), max_size=0, disk_path=disk_path)
+        await adapter.read(f"{directory}/file")
+        with open(path.join(disk_path, "unrelated"), "wb") as file:
+            file.write(b"Hello world!")
+
+        CachingAdapter(LocalAdapter(), disk_path=disk_path)
+
+        assert os.listdir(disk_path) == ["unrelated"]
+
+        shutil.rmtree(disk_path)
+
+    @pytest.mark.anyio
+    async def test_disk_cache_write_fails(
+        self, directory: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        disk_path = path.join("/tmp", str(uuid4()))
+        adapter = CachingAdapter(LocalAdapter(), max_size=0, disk_path=disk_path)
+
+        async def move(self: LocalAdapter, source: str, destination: str) -> File:
+            raise OSError("Injected")
+
+        monkeypatch.setattr(LocalAdapter, "move", move)
+
+        with pytest.raises(OSError):
+            await adapter.read(f"{directory}/file")
+        assert os.listdir(disk_path) == []
+
+        shutil.rmtree(disk_path)
+
+
+class TestMetadataCachingAdapter:
+    @pytest.mark.anyio
+    async def test_get_metadata(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter)
+
+        metadata = await adapter.get_metadata(f"{directory}/file")
+        os.remove(path.join(directory, "file"))
+
+        assert await adapter.get_metadata(f"{directory}/file") == metadata
+        assert (await adapter.get_file(f"{directory}/file")).path == (
+            f"{directory}/file"
+        )
+        assert counting_adapter.metadata_lookups == 1
+
+    @pytest.mark.anyio
+    async def test_get_metadata_non_existing(self) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter)
+        file_path = "/this/path/does/not/exist"
+
+        for _ in range(2):
+            with pytest.raises(NotFoundException) as exception_info:
+                await adapter.get_file(file_path)
+
+            assert str(exception_info.value) == f"Failed to find file '{file_path}'!"
+
+        assert counting_adapter.metadata_lookups == 1
+
+    @pytest.mark.anyio
+    async def test_get_metadata_expired(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter, ttl=0)
+
+        await adapter.get_metadata(f"{directory}/file")
+        await adapter.get_metadata(f"{directory}/file")
+
+        assert counting_adapter.metadata_lookups == 2
+
+    @pytest.mark.anyio
+    async def test_get_metadata_coalesced(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter)
+
+        results = await asyncio.gather(
+            *(adapter.get_metadata(f"{directory}/file") for _ in range(100))
+        )
+
+        assert all(metadata.size == 12 for metadata in results)
+        assert counting_adapter.metadata_lookups == 1
+
+    @pytest.mark.anyio
+    async def test_list_provides_metadata(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter)
+
+        await adapter.list(directory)
+
+        assert (await adapter.get_metadata(f"{directory}/file")).size == 12
+        assert counting_adapter.metadata_lookups == 0
+
+    @pytest.mark.anyio
+    async def test_write_invalidates(self, directory: str) -> None:
+        adapter = MetadataCachingAdapter(LocalAdapter())
+        await adapter.list(directory)
+        await adapter.get_metadata(f"{directory}/file")
+
+        await adapter.write(f"{directory}/file", b"Hello big world!")
+        await adapter.write(f"{directory}/third", b"Hello world!")
+
+        assert (await adapter.get_metadata(f"{directory}/file")).size == 16
+        assert sorted(item.path for item in await adapter.list(directory)) == [
+            f"{directory}/file",
+            f"{directory}/second",
+            f"{directory}/third",
+        ]
+
+    @pytest.mark.anyio
+    async def test_delete_invalidates(self, directory: str) -> None:
+        adapter = MetadataCachingAdapter(LocalAdapter())
+        await adapter.get_metadata(f"{directory}/file")
+        os.makedirs(path.join(directory, "nested"))
+        assert any(
+            isinstance(item, Directory) for item in await adapter.list(directory)
+        )
+
+        await adapter.delete(f"{directory}/file")
+
+        with pytest.raises(NotFoundException):
+            await adapter.get_metadata(f"{directory}/file")
+        assert len(await adapter.list(directory)) == 2
+
+    @pytest.mark.anyio
+    async def test_write_to_other_path_during_lookup(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = MetadataCachingAdapter(counting_adapter)
+        lookup = asyncio.ensure_future(adapter.get_metadata(f"{directory}/file"))
+        await asyncio.sleep(0)
+
+        await adapter.write(f"{directory}/other", b"Hello world!")
+        await lookup
+        await adapter.get_metadata(f"{directory}/file")
+
+        assert counting_adapter.metadata_lookups == 1
+
+    @pytest.mark.anyio
+    async def test_list_root(
+        self, directory: str, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(directory)
+        adapter = MetadataCachingAdapter(LocalAdapter())
+
+        assert "/tmp" in [item.path for item in await adapter.list("/")]
+        assert sorted(item.path for item in await adapter.list("")) == [
+            "file",
+            "second",
+        ]
+
+    @pytest.mark.anyio
+    async def test_write_invalidates_root(self) -> None:
+        adapter = MetadataCachingAdapter(MemoryAdapter())
+        await adapter.write("/file", b"Hello world!")
+        await adapter.list("/")
+
+        await adapter.write("/second", b"Hello world!")
+
+        assert [item.path for item in await adapter.list("/")] == [
+            "/file",
+            "/second",
+        ]
+
+
+class TestSingleFlightAdapter:
+    @pytest.mark.anyio
+    async def test_read(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = SingleFlightAdapter(counting_adapter)
+
+        results = await asyncio.gather(
+            *(adapter.read(f"{directory}/file") for _ in range(100))
+        )
+
+        assert results == [b"Hello world!"] * 100
+        assert counting_adapter.reads == 1
+
+    @pytest.mark.anyio
+    async def test_read_sequential(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = SingleFlightAdapter(counting_adapter)
+
+        await adapter.read(f"{directory}/file")
+        await adapter.read(f"{directory}/file")
+
+        assert counting_adapter.reads == 2
+
+    @pytest.mark.anyio
+    async def test_read_non_existing(self) -> None:
+        adapter = SingleFlightAdapter(CountingAdapter(LocalAdapter()))
+
+        results = await asyncio.gather(
+            *(adapter.read("/this/path/does/not/exist") for _ in range(2)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, NotFoundException) for result in results)
+
+    @pytest.mark.anyio
+    async def test_file_size(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = SingleFlightAdapter(counting_adapter)
+
+        files = await asyncio.gather(
+            *(adapter.get_file(f"{directory}/file") for _ in range(100))
+        )
+        sizes = await asyncio.gather(*(file.size for file in files))
+
+        assert sizes == [12] * 100
+        assert counting_adapter.file_lookups == 1
+
+    @pytest.mark.anyio
+    async def test_get_metadata(self, directory: str) -> None:
+        counting_adapter = CountingAdapter(LocalAdapter())
+        adapter = SingleFlightAdapter(counting_adapter)
+
+        results = await asyncio.gather(
+            *(adapter.get_metadata(f"{directory}/file") for _ in range(100))
+        )
+
+        assert [metadata.size for metadata in results] == [12] * 100
+        assert counting_adapter.metadata_lookups == 1
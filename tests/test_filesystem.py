@@ -0,0 +1,324 @@
+import os
+from os import path
+from typing import AsyncIterator
+from uuid import uuid4
+
+import pytest
+
+from plugfs.filesystem import (
+    Adapter,
+    DirectoryListing,
+    File,
+    Filesystem,
+    NotFoundException,
+)
+from plugfs.local import LocalAdapter
+from plugfs.memory import MemoryAdapter
+from plugfs.wrapper import WrappingAdapter
+
+RESOURCES = path.join(path.abspath(path.dirname(__file__)), "resources")
+
+
+class MinimalAdapter(Adapter):
+    """Only implements the abstract operations, the others use their defaults."""
+
+    _adapter: MemoryAdapter
+
+    def __init__(self) -> None:
+        self._adapter = MemoryAdapter()
+
+    async def list(self, path: str) -> DirectoryListing:
+        return await self._adapter.list(path)
+
+    async def read(self, path: str) -> bytes:
+        return await self._adapter.read(path)
+
+    async def get_iterator(
+        self, path: str, chunk_size: int | None = None, read_ahead: int = 0
+    ) -> AsyncIterator[bytes]:
+        return await self._adapter.get_iterator(path, chunk_size, read_ahead)
+
+    async def get_file(self, path: str) -> File:
+        return await self._adapter.get_file(path)
+
+    async def write(self, path: str, data: bytes) -> File:
+        return await self._adapter.write(path, data)
+
+    async def write_iterator(self, path: str, iterator: AsyncIterator[bytes]) -> File:
+        return await self._adapter.write_iterator(path, iterator)
+
+    async def makedirs(self, path: str) -> None:
+        await self._adapter.makedirs(path)
+
+    async def delete(self, path: str) -> None:
+        await self._adapter.delete(path)
+
+
+@pytest.fixture
+def filesystem() -> Filesystem:
+    return Filesystem(LocalAdapter())
+
+
+class TestFilesystem:
+    @pytest.mark.anyio
+    async def test_walk(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.walk(RESOURCES)
+
+        assert sorted([file.path async for file in iterator]) == [
+            f"{RESOURCES}/10mb.bin",
+            f"{RESOURCES}/1mb.bin",
+            f"{RESOURCES}/directory/256kb.bin",
+        ]
+
+    @pytest.mark.anyio
+    async def test_walk_non_existing(self, filesystem: Filesystem) -> None:
+        with pytest.raises(NotFoundException) as exception_info:
+            await filesystem.walk("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to retrieve directory listing for '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_glob(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.glob(f"{RESOURCES}/*.bin")
+
+        assert sorted([file.path async for file in iterator]) == [
+            f"{RESOURCES}/10mb.bin",
+            f"{RESOURCES}/1mb.bin",
+        ]
+
+    @pytest.mark.anyio
+    async def test_glob_recursive(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.glob(f"{RESOURCES}/**/2*.bin")
+
+        assert [file.path async for file in iterator] == [
+            f"{RESOURCES}/directory/256kb.bin"
+        ]
+
+    @pytest.mark.anyio
+    async def test_glob_name_prefix(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.glob(f"{RESOURCES}/1*")
+
+        assert sorted([file.path async for file in iterator]) == [
+            f"{RESOURCES}/10mb.bin",
+            f"{RESOURCES}/1mb.bin",
+        ]
+
+    @pytest.mark.anyio
+    async def test_glob_literal(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.glob(f"{RESOURCES}/directory/256kb.bin")
+
+        assert [file.path async for file in iterator] == [
+            f"{RESOURCES}/directory/256kb.bin"
+        ]
+
+    @pytest.mark.anyio
+    async def test_glob_relative(
+        self, filesystem: Filesystem, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.chdir(RESOURCES)
+
+        iterator = await filesystem.glob("*.bin")
+        assert sorted([file.path async for file in iterator]) == [
+            "10mb.bin",
+            "1mb.bin",
+        ]
+
+        iterator = await filesystem.glob("**/2*.bin")
+        assert [file.path async for file in iterator] == ["directory/256kb.bin"]
+
+    @pytest.mark.anyio
+    async def test_glob_root(self) -> None:
+        walks = []
+
+        class RecordingAdapter(WrappingAdapter):
+            async def walk(
+                self, path: str, name_prefix: str = ""
+            ) -> AsyncIterator[File]:
+                walks.append((path, name_prefix))
+                return await super().walk(path, name_prefix)
+
+        memory = MemoryAdapter()
+        for file_path in ["/a.bin", "/b.txt", "/directory/c.bin"]:
+            await memory.write(file_path, b"Hello world!")
+
+        iterator = await Filesystem(RecordingAdapter(memory)).glob("/*.bin")
+
+        assert [file.path async for file in iterator] == ["/a.bin"]
+        assert walks == [("/", "")]
+
+    @pytest.mark.anyio
+    async def test_list_root(self, filesystem: Filesystem) -> None:
+        items = await filesystem.list("/")
+
+        assert "/tmp" in [item.path for item in items]
+
+    @pytest.mark.anyio
+    async def test_read_range(self, filesystem: Filesystem) -> None:
+        file = await filesystem.get_file(f"{RESOURCES}/1mb.bin")
+        data = await file.read()
+
+        assert await file.read_range(1024, 8) == data[1024:1032]
+        assert await filesystem.read_range(f"{RESOURCES}/1mb.bin", 1024, 8) == (
+            data[1024:1032]
+        )
+
+    @pytest.mark.anyio
+    async def test_delete_many(self, filesystem: Filesystem) -> None:
+        dir_path = path.join("/tmp", str(uuid4()))
+        os.mkdir(dir_path)
+        paths = [f"{dir_path}/{index}" for index in range(20)]
+        for file_path in paths:
+            with open(file_path, "wb") as file:
+                file.write(b"Hello world!")
+
+        results = await filesystem.delete_many(
+            [*paths, f"{dir_path}/missing"], max_concurrency=4
+        )
+
+        assert results[:20] == [None] * 20
+        assert isinstance(results[20], NotFoundException)
+        assert (
+            str(results[20])
+            == f"Failed to delete file '{dir_path}/missing', file does not exist!"
+        )
+        assert os.listdir(dir_path) == []
+
+        os.rmdir(dir_path)
+
+    @pytest.mark.anyio
+    async def test_get_files(self, filesystem: Filesystem) -> None:
+        results = await filesystem.get_files(
+            [f"{RESOURCES}/1mb.bin", "/this/path/does/not/exist"]
+        )
+
+        assert isinstance(results[0], File)
+        assert results[0].path == f"{RESOURCES}/1mb.bin"
+        assert isinstance(results[1], NotFoundException)
+        assert str(results[1]) == "Failed to find file '/this/path/does/not/exist'!"
+
+    @pytest.mark.anyio
+    async def test_read_many(self, filesystem: Filesystem) -> None:
+        results = await filesystem.read_many(
+            [
+                f"{RESOURCES}/1mb.bin",
+                "/this/path/does/not/exist",
+                f"{RESOURCES}/directory/256kb.bin",
+            ],
+            max_concurrency=2,
+        )
+
+        assert isinstance(results[0], bytes) and len(results[0]) == 1048576
+        assert isinstance(results[1], NotFoundException)
+        assert isinstance(results[2], bytes) and len(results[2]) == 262144
+
+    @pytest.mark.anyio
+    async def test_copy_across_adapters(self, filesystem: Filesystem) -> None:
+        target = Filesystem(MemoryAdapter())
+
+        file = await filesystem.copy(f"{RESOURCES}/1mb.bin", "/1mb.bin", target)
+
+        with open(f"{RESOURCES}/1mb.bin", "rb") as source:
+            assert await file.read() == source.read()
+
+    @pytest.mark.anyio
+    async def test_copy_across_local_adapters(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        adapter = LocalAdapter()
+        destination = path.join("/tmp", str(uuid4()))
+        copies = []
+        copy = adapter.copy
+
+        async def recording_copy(source: str, destination: str) -> File:
+            copies.append((source, destination))
+            return await copy(source, destination)
+
+        monkeypatch.setattr(adapter, "copy", recording_copy)
+
+        file = await Filesystem(adapter).copy(
+            f"{RESOURCES}/1mb.bin", destination, Filesystem(LocalAdapter())
+        )
+
+        with open(f"{RESOURCES}/1mb.bin", "rb") as source:
+            assert await file.read() == source.read()
+        assert copies == [(f"{RESOURCES}/1mb.bin", destination)]
+
+        os.remove(destination)
+
+    @pytest.mark.anyio
+    async def test_move_across_adapters(self, filesystem: Filesystem) -> None:
+        target = Filesystem(LocalAdapter())
+        source = path.join("/tmp", str(uuid4()))
+        destination = path.join("/tmp", str(uuid4()))
+        await filesystem.write(source, b"Hello world!")
+
+        file = await filesystem.move(source, destination, target)
+
+        assert await file.read() == b"Hello world!"
+        assert not path.exists(source)
+
+        os.remove(destination)
+
+    @pytest.mark.anyio
+    async def test_get_iterator_read_ahead(self, filesystem: Filesystem) -> None:
+        iterator = await filesystem.get_iterator(
+            f"{RESOURCES}/10mb.bin", chunk_size=4 * 1024 * 1024, read_ahead=2
+        )
+
+        sizes = [len(chunk) async for chunk in iterator]
+
+        assert sizes == [4194304, 4194304, 2097152]
+
+    @pytest.mark.anyio
+    async def test_get_iterator_read_ahead_stopped_early(
+        self, filesystem: Filesystem
+    ) -> None:
+        iterator = await filesystem.get_iterator(
+            f"{RESOURCES}/10mb.bin", chunk_size=1024, read_ahead=4
+        )
+
+        async for chunk in iterator:
+            assert len(chunk) == 1024
+            break
+
+
+class TestAdapterDefaults:
+    @pytest.mark.anyio
+    async def test_reads(self) -> None:
+        adapter = MinimalAdapter()
+        for file_path in ["/a.bin", "/b.txt", "/directory/c.bin"]:
+            await adapter.write(file_path, b"Hello world!")
+
+        assert [item.path async for item in await adapter.iter_list("/")] == [
+            "/a.bin",
+            "/b.txt",
+            "/directory",
+        ]
+        assert [file.path async for file in await adapter.walk("/", "a")] == ["/a.bin"]
+        assert [file.path async for file in await adapter.walk("/")] == [
+            "/a.bin",
+            "/b.txt",
+            "/directory/c.bin",
+        ]
+        assert await adapter.read_range("/a.bin", 6, 5) == b"world"
+        assert (await adapter.get_metadata("/a.bin")).size == 12
+        with pytest.raises(ValueError):
+            await adapter.read_range("/a.bin", -1)
+
+    @pytest.mark.anyio
+    async def test_writes(self) -> None:
+        adapter = MinimalAdapter()
+        await adapter.write("/a.bin", b"Hello world!")
+
+        await adapter.copy("/a.bin", "/b.bin")
+        await adapter.move("/b.bin", "/c.bin")
+        await adapter.move("/c.bin", "/c.bin")
+        results = await adapter.delete_many(["/a.bin", "/missing"], max_concurrency=4)
+
+        assert [file.path async for file in await adapter.walk("/")] == ["/c.bin"]
+        assert await adapter.read("/c.bin") == b"Hello world!"
+        assert results[0] is None
+        assert isinstance(results[1], NotFoundException)
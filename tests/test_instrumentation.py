@@ -0,0 +1,86 @@
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
+import pytest
+
+from plugfs.filesystem import NotFoundException
+from plugfs.instrumentation import InstrumentedAdapter
+from plugfs.local import LocalAdapter
+
+
+class TestInstrumentedAdapter:
+    @pytest.mark.anyio
+    async def test_read(self, directory: str) -> None:
+        adapter = InstrumentedAdapter(LocalAdapter())
+
+        await adapter.read(f"{directory}/file")
+        await adapter.read_range(f"{directory}/file", 6, 5)
+
+        statistics = adapter.statistics
+        assert statistics["read"].calls == 1
+        assert statistics["read"].bytes_read == 12
+        assert statistics["read"].in_flight == 0
+        assert statistics["read"].max_in_flight == 1
+        assert sum(statistics["read"].latencies) == 1
+        assert statistics["read_range"].bytes_read == 5
+
+    @pytest.mark.anyio
+    async def test_file_operations_are_recorded(self, directory: str) -> None:
+        adapter = InstrumentedAdapter(LocalAdapter())
+
+        file = await adapter.get_file(f"{directory}/file")
+        await file.read()
+
+        assert adapter.statistics["get_file"].calls == 1
+        assert adapter.statistics["read"].calls == 1
+
+    @pytest.mark.anyio
+    async def test_iterators(self, directory: str) -> None:
+        adapter = InstrumentedAdapter(LocalAdapter())
+
+        await adapter.write_iterator(
+            f"{directory}/copy", await adapter.get_iterator(f"{directory}/file", 5)
+        )
+
+        statistics = adapter.statistics
+        assert statistics["get_iterator"].bytes_read == 12
+        assert statistics["write_iterator"].bytes_written == 12
+
+    @pytest.mark.anyio
+    async def test_errors(self) -> None:
+        adapter = InstrumentedAdapter(LocalAdapter())
+
+        with pytest.raises(NotFoundException):
+            await adapter.read("/this/path/does/not/exist")
+
+        assert adapter.statistics["read"].errors == 1
+        assert adapter.statistics["read"].in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_spans(self, directory: str) -> None:
+        spans = []
+
+        @contextmanager
+        def span_factory(name: str, attributes: Mapping[str, str]) -> Iterator[None]:
+            spans.append((name, dict(attributes)))
+            yield
+
+        adapter = InstrumentedAdapter(
+            LocalAdapter(), name="local", span_factory=span_factory
+        )
+        await adapter.write(f"{directory}/new", b"Hello world!")
+
+        assert spans == [
+            (
+                "plugfs.write",
+                {"plugfs.adapter": "local", "plugfs.path": f"{directory}/new"},
+            )
+        ]
+        assert adapter.statistics["write"].bytes_written == 12
+
+    @pytest.mark.anyio
+    async def test_disabled(self, directory: str) -> None:
+        adapter = InstrumentedAdapter(LocalAdapter(), enabled=False)
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+        assert adapter.statistics == {}
@@ -0,0 +1,124 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+
+from plugfs.filesystem import File
+from plugfs.limiting import LimitingAdapter
+from plugfs.local import LocalAdapter
+from plugfs.wrapper import WrappingAdapter
+
+
+class TrackingAdapter(WrappingAdapter):
+    in_flight: int = 0
+    max_in_flight: int = 0
+    started: list[str]
+
+    def __init__(self) -> None:
+        super().__init__(LocalAdapter())
+        self.started = []
+
+    async def _track(self, path: str) -> None:
+        self.started.append(path)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+
+    async def read(self, path: str) -> bytes:
+        await self._track(path)
+        return await super().read(path)
+
+    async def write(self, path: str, data: bytes) -> File:
+        await self._track(path)
+        return await super().write(path, data)
+
+
+class TestLimitingAdapter:
+    @pytest.mark.anyio
+    async def test_max_concurrency(self, directory: str) -> None:
+        tracking = TrackingAdapter()
+        adapter = LimitingAdapter(tracking, max_concurrency=4)
+
+        results = await asyncio.gather(
+            *(adapter.read(f"{directory}/file") for _ in range(20))
+        )
+
+        assert results == [b"Hello world!"] * 20
+        assert tracking.max_in_flight == 4
+        assert adapter.statistics.in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_max_bytes(self, directory: str) -> None:
+        tracking = TrackingAdapter()
+        adapter = LimitingAdapter(tracking, max_bytes=24)
+
+        await asyncio.gather(
+            *(
+                adapter.write(f"{directory}/{index}", b"Hello world!")
+                for index in range(8)
+            )
+        )
+
+        assert tracking.max_in_flight == 2
+        assert adapter.statistics.bytes_in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_large_write_is_not_starved(self, directory: str) -> None:
+        tracking = TrackingAdapter()
+        adapter = LimitingAdapter(tracking, max_bytes=24)
+
+        small = [
+            asyncio.ensure_future(adapter.write(f"{directory}/small_{index}", b"small"))
+            for index in range(2)
+        ]
+        await asyncio.sleep(0)
+        large = asyncio.ensure_future(
+            adapter.write(f"{directory}/large", b"Larger than the budget")
+        )
+        await asyncio.sleep(0)
+        later = asyncio.ensure_future(adapter.write(f"{directory}/later", b"small"))
+        await asyncio.sleep(0)
+
+        assert adapter.statistics.waiting == 2
+
+        await asyncio.gather(*small, large, later)
+
+        assert tracking.started[2:] == [f"{directory}/large", f"{directory}/later"]
+
+    @pytest.mark.anyio
+    async def test_cancelled_waiter(self, directory: str) -> None:
+        tracking = TrackingAdapter()
+        adapter = LimitingAdapter(tracking, max_concurrency=1)
+
+        first = asyncio.ensure_future(adapter.read(f"{directory}/file"))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(adapter.read(f"{directory}/file"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+        assert await first == b"Hello world!"
+        assert tracking.started == [f"{directory}/file"] * 2
+        assert adapter.statistics.waiting == 0
+
+    @pytest.mark.anyio
+    async def test_write_iterator(self, directory: str) -> None:
+        adapter = LimitingAdapter(LocalAdapter(), max_bytes=8)
+        in_flight = []
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in [b"Hello ", b"world!"]:
+                in_flight.append(adapter.statistics.bytes_in_flight)
+                yield chunk
+
+        file = await adapter.write_iterator(f"{directory}/iterated", chunks())
+
+        assert await file.read() == b"Hello world!"
+        assert in_flight == [0, 0]
+        assert adapter.statistics.bytes_in_flight == 0
+
+    @pytest.mark.anyio
+    async def test_invalid_concurrency(self) -> None:
+        with pytest.raises(ValueError):
+            LimitingAdapter(LocalAdapter(), max_concurrency=0)
@@ -1,4 +1,6 @@
+import asyncio
 import os
+import shutil
 from os import path
 from typing import AsyncIterator
 from uuid import uuid4
@@ -6,7 +8,7 @@ from uuid import uuid4
 import pytest
 
 from plugfs.filesystem import Directory, NotFoundException
-from plugfs.local import LocalAdapter, LocalFile
+from plugfs.local import FileDescriptorSource, LocalAdapter, LocalFile
 
 
 class TestLocalAdapter:
@@ -44,6 +46,22 @@ class TestLocalAdapter:
             and directory_found is True
         )
 
+    @pytest.mark.anyio
+    async def test_list_dangling_symlink(self) -> None:
+        adapter = LocalAdapter()
+        dir_path = path.join("/tmp", str(uuid4()))
+        os.mkdir(dir_path)
+        os.symlink("/this/path/does/not/exist", path.join(dir_path, "link"))
+
+        items = await adapter.list(dir_path)
+
+        assert len(items) == 1
+        assert isinstance(items[0], LocalFile)
+        assert items[0].path == f"{dir_path}/link"
+
+        os.remove(path.join(dir_path, "link"))
+        os.rmdir(dir_path)
+
     @pytest.mark.anyio
     async def test_list_non_existing(self) -> None:
         adapter = LocalAdapter()
@@ -55,6 +73,79 @@ class TestLocalAdapter:
             == "Failed to retrieve directory listing for '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_iter_list(self) -> None:
+        adapter = LocalAdapter()
+        dir_path = path.join(path.dirname(__file__), "resources")
+
+        iterator = await adapter.iter_list(dir_path)
+        items = [item async for item in iterator]
+
+        assert sorted(item.path for item in items) == sorted(
+            item.path for item in await adapter.list(dir_path)
+        )
+
+    @pytest.mark.anyio
+    async def test_iter_list_multiple_batches(self) -> None:
+        adapter = LocalAdapter()
+        dir_path = path.join("/tmp", str(uuid4()))
+        os.mkdir(dir_path)
+        for index in range(2500):
+            with open(path.join(dir_path, str(index)), "wb"):
+                pass
+
+        iterator = await adapter.iter_list(dir_path)
+        names = {item.path async for item in iterator}
+
+        assert names == {f"{dir_path}/{index}" for index in range(2500)}
+
+        shutil.rmtree(dir_path)
+
+    @pytest.mark.anyio
+    async def test_iter_list_non_existing(self) -> None:
+        adapter = LocalAdapter()
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.iter_list("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to retrieve directory listing for '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_walk(self) -> None:
+        adapter = LocalAdapter(walk_concurrency=2)
+        dir_path = path.join("/tmp", str(uuid4()))
+        for directory in ["a/b/c", "a/d", "e"]:
+            os.makedirs(path.join(dir_path, directory))
+            with open(path.join(dir_path, directory, "file"), "wb") as file:
+                file.write(b"Hello world!")
+        # A symbolic link back to the root would make the walk go round in circles.
+        os.symlink(dir_path, path.join(dir_path, "a", "loop"))
+
+        iterator = await adapter.walk(dir_path)
+        files = {file.path: await file.size async for file in iterator}
+
+        assert files == {
+            f"{dir_path}/a/b/c/file": 12,
+            f"{dir_path}/a/d/file": 12,
+            f"{dir_path}/e/file": 12,
+        }
+
+        shutil.rmtree(dir_path)
+
+    @pytest.mark.anyio
+    async def test_walk_name_prefix(self) -> None:
+        adapter = LocalAdapter()
+
+        iterator = await adapter.walk(
+            path.join(path.dirname(__file__), "resources"), "dir"
+        )
+
+        assert [file.path async for file in iterator] == [
+            f"{path.join(path.dirname(__file__), "resources")}/directory/256kb.bin"
+        ]
+
     @pytest.mark.anyio
     async def test_read(self) -> None:
         adapter = LocalAdapter()
@@ -77,6 +168,45 @@ class TestLocalAdapter:
             == "Failed to find file '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_read_range(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        with open(filepath, "rb") as file:
+            expected = file.read()
+
+        assert await adapter.read_range(filepath, 1000, 24) == expected[1000:1024]
+        assert await adapter.read_range(filepath, 1048000) == expected[1048000:]
+        assert await adapter.read_range(filepath, 1048570, 100) == expected[1048570:]
+        assert await adapter.read_range(filepath, 2000000, 100) == b""
+
+    @pytest.mark.anyio
+    async def test_read_range_invalid(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+
+        assert await adapter.read_range(filepath, 1000, 0) == b""
+        with pytest.raises(ValueError):
+            await adapter.read_range(filepath, -1, 10)
+        with pytest.raises(ValueError):
+            await adapter.read_range(filepath, 0, -1)
+
+    @pytest.mark.anyio
+    async def test_read_range_non_existing(self) -> None:
+        adapter = LocalAdapter()
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.read_range("/this/path/does/not/exist", 0, 10)
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
     @pytest.mark.anyio
     async def test_get_iterator(self) -> None:
         adapter = LocalAdapter()
@@ -98,6 +228,36 @@ class TestLocalAdapter:
         assert len(data) == 10485760
         assert count == 10
 
+    @pytest.mark.anyio
+    async def test_get_iterator_chunk_size(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        with open(filepath, "rb") as file:
+            expected = file.read()
+
+        for read_ahead in [0, 2]:
+            iterator = await adapter.get_iterator(filepath, 300 * 1024, read_ahead)
+            chunks = [chunk async for chunk in iterator]
+
+            assert [len(chunk) for chunk in chunks] == [307200, 307200, 307200, 126976]
+            assert b"".join(chunks) == expected
+
+    @pytest.mark.anyio
+    async def test_get_iterator_invalid(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+
+        with pytest.raises(ValueError):
+            await adapter.get_iterator(filepath, chunk_size=-1)
+        with pytest.raises(ValueError):
+            await adapter.get_iterator(filepath, read_ahead=-1)
+        with pytest.raises(ValueError):
+            await adapter.get_view_iterator(filepath, chunk_size=0)
+
     @pytest.mark.anyio
     async def test_get_iterator_non_existing(self) -> None:
         adapter = LocalAdapter()
@@ -110,6 +270,116 @@ class TestLocalAdapter:
             == "Failed to find file '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_iterators_open_lazily(self) -> None:
+        adapter = LocalAdapter()
+        directory = path.join(path.abspath(path.dirname(__file__)), "resources")
+        open_files = len(os.listdir("/proc/self/fd"))
+
+        iterators = [
+            await adapter.get_iterator(f"{directory}/1mb.bin"),
+            await adapter.get_view_iterator(f"{directory}/1mb.bin"),
+            await adapter.iter_list(directory),
+        ]
+
+        assert len(os.listdir("/proc/self/fd")) == open_files
+        for iterator in iterators:
+            await anext(aiter(iterator))
+            await iterator.aclose()  # type: ignore[attr-defined]
+        assert len(os.listdir("/proc/self/fd")) == open_files
+
+    @pytest.mark.anyio
+    async def test_open_mmap(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        with open(filepath, "rb") as file:
+            expected = file.read()
+
+        async with adapter.open_mmap(filepath) as view:
+            assert len(view) == 1048576
+            assert view[1000:1024] == expected[1000:1024]
+
+    @pytest.mark.anyio
+    async def test_open_mmap_empty(self) -> None:
+        adapter = LocalAdapter()
+        file_path = path.join("/tmp", str(uuid4()))
+        open(file_path, "wb").close()
+
+        async with adapter.open_mmap(file_path) as view:
+            assert len(view) == 0
+
+        os.remove(file_path)
+
+    @pytest.mark.anyio
+    async def test_open_mmap_non_existing(self) -> None:
+        adapter = LocalAdapter()
+
+        with pytest.raises(NotFoundException) as exception_info:
+            async with adapter.open_mmap("/this/path/does/not/exist"):
+                pass
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_open_mmap_slice_kept(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        with open(filepath, "rb") as file:
+            expected = file.read(4)
+
+        async with adapter.open_mmap(filepath) as view:
+            header = view[:4]
+
+        assert header == expected
+
+    @pytest.mark.anyio
+    async def test_open_mmap_directory(self) -> None:
+        adapter = LocalAdapter()
+        directory = path.join(path.abspath(path.dirname(__file__)), "resources")
+
+        with pytest.raises(NotFoundException):
+            async with adapter.open_mmap(directory):
+                pass
+
+    @pytest.mark.anyio
+    async def test_get_view_iterator(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        with open(filepath, "rb") as file:
+            expected = file.read()
+
+        iterator = await adapter.get_view_iterator(filepath, 300 * 1024)
+
+        data = bytearray()
+        sizes = []
+        async for view in iterator:
+            sizes.append(len(view))
+            data += view
+
+        assert data == expected
+        assert sizes == [307200, 307200, 307200, 126976]
+
+    @pytest.mark.anyio
+    async def test_get_view_iterator_non_existing(self) -> None:
+        adapter = LocalAdapter()
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.get_view_iterator("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
     @pytest.mark.anyio
     async def test_get_file(self) -> None:
         adapter = LocalAdapter()
@@ -132,6 +402,65 @@ class TestLocalAdapter:
             == "Failed to find file '/this/path/does/not/exist'!"
         )
 
+    @pytest.mark.anyio
+    async def test_get_metadata(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+
+        metadata = await adapter.get_metadata(filepath)
+
+        assert metadata.size == 1048576
+        assert metadata.last_modified is not None
+        assert metadata.last_modified.timestamp() == os.stat(filepath).st_mtime
+        assert metadata.etag is not None
+        assert metadata.content_type == "application/octet-stream"
+
+    @pytest.mark.anyio
+    async def test_get_metadata_non_existing(self) -> None:
+        adapter = LocalAdapter()
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.get_metadata("/this/path/does/not/exist")
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
+    @pytest.mark.anyio
+    async def test_get_metadata_directory(self) -> None:
+        adapter = LocalAdapter()
+        dirpath = path.join(path.abspath(path.dirname(__file__)), "resources")
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.get_metadata(dirpath)
+
+        assert str(exception_info.value) == f"Failed to find file '{dirpath}'!"
+
+    @pytest.mark.anyio
+    async def test_list_provides_metadata(self) -> None:
+        adapter = LocalAdapter()
+        items = await adapter.list(path.join(path.dirname(__file__), "resources"))
+
+        for item in items:
+            if isinstance(item, LocalFile):
+                assert await item.metadata == await adapter.get_metadata(item.path)
+
+    @pytest.mark.anyio
+    async def test_file_write_refreshes_metadata(self) -> None:
+        adapter = LocalAdapter()
+        filepath = path.join("/tmp", str(uuid4()))
+
+        file = await adapter.write(filepath, b"Hello!")
+        assert await file.size == 6
+
+        await file.write(b"Hello world!")
+        assert await file.size == 12
+
+        os.remove(filepath)
+
     @pytest.mark.anyio
     async def test_write_new(self) -> None:
         adapter = LocalAdapter()
@@ -216,6 +545,95 @@ class TestLocalAdapter:
             == "Failed to write file '/this/path/does/not/exist', directory does not exist!"
         )
 
+    @pytest.mark.anyio
+    async def test_write_iterator_file_descriptor(self) -> None:
+        adapter = LocalAdapter()
+        file_path = path.join("/tmp", str(uuid4()))
+        source_path = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+
+        with open(source_path, "rb") as source:
+            expected = source.read()
+            source.seek(1000)
+            await adapter.write_iterator(
+                file_path, FileDescriptorSource(source.fileno())
+            )
+
+        with open(file_path, "rb") as file:
+            assert file.read() == expected[1000:]
+
+        os.remove(file_path)
+
+    @pytest.mark.anyio
+    async def test_write_iterator_pipe(self) -> None:
+        adapter = LocalAdapter()
+        file_path = path.join("/tmp", str(uuid4()))
+        read_end, write_end = os.pipe()
+        os.write(write_end, b"Hello world!")
+        os.close(write_end)
+
+        await adapter.write_iterator(file_path, FileDescriptorSource(read_end))
+        os.close(read_end)
+
+        with open(file_path, "rb") as file:
+            assert file.read() == b"Hello world!"
+
+        os.remove(file_path)
+
+    @pytest.mark.anyio
+    async def test_file_descriptor_source(self) -> None:
+        read_end, write_end = os.pipe()
+        os.write(write_end, b"Hello world!")
+        os.close(write_end)
+
+        chunks = [chunk async for chunk in FileDescriptorSource(read_end, 5)]
+        os.close(read_end)
+
+        assert b"".join(chunks) == b"Hello world!"
+
+    @pytest.mark.anyio
+    async def test_sendfile(self) -> None:
+        adapter = LocalAdapter()
+        source_path = path.join(
+            path.abspath(path.dirname(__file__)), "resources", "1mb.bin"
+        )
+        received = asyncio.get_running_loop().create_future()
+
+        async def receive(
+            reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+        ) -> None:
+            received.set_result(await reader.read())
+            writer.close()
+            await writer.wait_closed()
+
+        server = await asyncio.start_server(receive, "127.0.0.1", 0)
+        async with server:
+            _, writer = await asyncio.open_connection(
+                "127.0.0.1", server.sockets[0].getsockname()[1]
+            )
+            sent = await adapter.sendfile(source_path, writer)
+            writer.close()
+            await writer.wait_closed()
+
+            data = await received
+
+        with open(source_path, "rb") as file:
+            assert data == file.read()
+        assert sent == 1048576
+
+    @pytest.mark.anyio
+    async def test_sendfile_non_existing(self) -> None:
+        adapter = LocalAdapter()
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.sendfile("/this/path/does/not/exist", None)  # type: ignore[arg-type]
+
+        assert (
+            str(exception_info.value)
+            == "Failed to find file '/this/path/does/not/exist'!"
+        )
+
     @pytest.mark.anyio
     async def test_makedirs(self) -> None:
         adapter = LocalAdapter()
@@ -251,3 +669,86 @@ class TestLocalAdapter:
         await adapter.delete(file_path)
 
         assert not path.exists(file_path)
+
+    @pytest.mark.anyio
+    async def test_copy(self) -> None:
+        adapter = LocalAdapter()
+        source = path.join("/tmp", str(uuid4()))
+        destination = path.join("/tmp", str(uuid4()))
+
+        with open(source, "wb") as file:
+            file.write(b"Hello world!")
+
+        copied = await adapter.copy(source, destination)
+
+        assert copied.path == destination
+        assert await copied.read() == b"Hello world!"
+        assert path.exists(source)
+
+        os.remove(source)
+        os.remove(destination)
+
+    @pytest.mark.anyio
+    async def test_copy_same_file(self) -> None:
+        adapter = LocalAdapter()
+        source = path.join("/tmp", str(uuid4()))
+        link = path.join("/tmp", str(uuid4()))
+
+        with open(source, "wb") as file:
+            file.write(b"Hello world!")
+        os.link(source, link)
+
+        for destination in [source, link]:
+            with pytest.raises(shutil.SameFileError):
+                await adapter.copy(source, destination)
+
+        with open(source, "rb") as file:
+            assert file.read() == b"Hello world!"
+
+        os.remove(source)
+        os.remove(link)
+
+    @pytest.mark.anyio
+    async def test_copy_non_existing(self) -> None:
+        adapter = LocalAdapter()
+        source = "/this/path/does/not/exist"
+        destination = path.join("/tmp", str(uuid4()))
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.copy(source, destination)
+
+        assert (
+            str(exception_info.value)
+            == f"Failed to copy file '{source}' to '{destination}', file or directory does not exist!"
+        )
+
+    @pytest.mark.anyio
+    async def test_move(self) -> None:
+        adapter = LocalAdapter()
+        source = path.join("/tmp", str(uuid4()))
+        destination = path.join("/tmp", str(uuid4()))
+
+        with open(source, "wb") as file:
+            file.write(b"Hello world!")
+
+        moved = await adapter.move(source, destination)
+
+        assert moved.path == destination
+        assert await moved.read() == b"Hello world!"
+        assert not path.exists(source)
+
+        os.remove(destination)
+
+    @pytest.mark.anyio
+    async def test_move_non_existing(self) -> None:
+        adapter = LocalAdapter()
+        source = "/this/path/does/not/exist"
+        destination = path.join("/tmp", str(uuid4()))
+
+        with pytest.raises(NotFoundException) as exception_info:
+            await adapter.move(source, destination)
+
+        assert (
+            str(exception_info.value)
+            == f"Failed to move file '{source}' to '{destination}', file or directory does not exist!"
+        )
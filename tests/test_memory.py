@@ -0,0 +1,214 @@
+from typing import AsyncIterator
+
+import pytest
+
+from plugfs.filesystem import Directory, File, Filesystem, NotFoundException
+from plugfs.local import LocalAdapter
+from plugfs.memory import CapacityExceededException, MemoryAdapter, MemoryFile
+
+
+@pytest.fixture
+async def memory_adapter() -> MemoryAdapter:
+    adapter = MemoryAdapter()
+    for path in [
+        "/a.txt",
+        "/b/c.txt",
+        "/b/d/e.txt",
+        "/b-c.txt",
+        "/f.bin",
+    ]:
+        await adapter.write(path, b"Hello world!")
+
+    return adapter
+
+
+class TestMemoryAdapter:
+    @pytest.mark.anyio
+    async def test_list(self, memory_adapter: MemoryAdapter) -> None:
+        items = await memory_adapter.list("/")
+
+        assert [(type(item), item.path) for item in items] == [
+            (MemoryFile, "/a.txt"),
+            (MemoryFile, "/b-c.txt"),
+            (Directory, "/b"),
+            (MemoryFile, "/f.bin"),
+        ]
+        assert [item.path for item in await memory_adapter.list("/b")] == [
+            "/b/c.txt",
+            "/b/d",
+        ]
+
+    @pytest.mark.anyio
+    async def test_list_missing_directory(self, memory_adapter: MemoryAdapter) -> None:
+        assert await memory_adapter.list("/missing") == []
+
+    @pytest.mark.anyio
+    async def test_list_empty_path(self, memory_adapter: MemoryAdapter) -> None:
+        await memory_adapter.write("g.txt", b"Hello world!")
+
+        assert [item.path for item in await memory_adapter.list("")] == ["g.txt"]
+
+    @pytest.mark.anyio
+    async def test_iter_list(self, memory_adapter: MemoryAdapter) -> None:
+        items = [item.path async for item in await memory_adapter.iter_list("/b/")]
+
+        assert items == ["/b/c.txt", "/b/d"]
+
+    @pytest.mark.anyio
+    async def test_walk(self, memory_adapter: MemoryAdapter) -> None:
+        files = [file.path async for file in await memory_adapter.walk("/b")]
+
+        assert files == ["/b/c.txt", "/b/d/e.txt"]
+
+    @pytest.mark.anyio
+    async def test_glob(self, memory_adapter: MemoryAdapter) -> None:
+        filesystem = Filesystem(memory_adapter)
+
+        files = [file.path async for file in await filesystem.glob("/**/*.txt")]
+
+        assert files == ["/a.txt", "/b-c.txt", "/b/c.txt", "/b/d/e.txt"]
+
+    @pytest.mark.anyio
+    async def test_read(self, memory_adapter: MemoryAdapter) -> None:
+        file = await memory_adapter.get_file("/a.txt")
+
+        assert await file.read() == b"Hello world!"
+        assert await file.read_range(6, 5) == b"world"
+        assert await file.read_range(6) == b"world!"
+        assert await file.read_range(20) == b""
+
+    @pytest.mark.anyio
+    async def test_read_range_invalid(self, memory_adapter: MemoryAdapter) -> None:
+        assert await memory_adapter.read_range("/a.txt", 6, 0) == b""
+        with pytest.raises(ValueError):
+            await memory_adapter.read_range("/a.txt", -1, 5)
+        with pytest.raises(ValueError):
+            await memory_adapter.read_view("/a.txt", 0, -1)
+
+    @pytest.mark.anyio
+    async def test_read_not_found(self, memory_adapter: MemoryAdapter) -> None:
+        with pytest.raises(NotFoundException):
+            await memory_adapter.read("/missing")
+
+    @pytest.mark.anyio
+    async def test_read_view(self, memory_adapter: MemoryAdapter) -> None:
+        data = await memory_adapter.read("/a.txt")
+
+        view = await memory_adapter.read_view("/a.txt", 6, 5)
+        await memory_adapter.write("/a.txt", b"Overwritten")
+
+        assert bytes(view) == b"world"
+        assert view.obj is data
+
+    @pytest.mark.anyio
+    async def test_get_iterator(self, memory_adapter: MemoryAdapter) -> None:
+        iterator = await memory_adapter.get_iterator("/a.txt", chunk_size=5)
+
+        assert [chunk async for chunk in iterator] == [b"Hello", b" worl", b"d!"]
+
+    @pytest.mark.anyio
+    async def test_get_iterator_invalid(self, memory_adapter: MemoryAdapter) -> None:
+        with pytest.raises(ValueError):
+            await memory_adapter.get_iterator("/a.txt", chunk_size=0)
+        with pytest.raises(ValueError):
+            await memory_adapter.get_iterator("/a.txt", read_ahead=-1)
+        with pytest.raises(ValueError):
+            await memory_adapter.get_view_iterator("/a.txt", chunk_size=-1)
+
+    @pytest.mark.anyio
+    async def test_get_view_iterator(self, memory_adapter: MemoryAdapter) -> None:
+        file = await memory_adapter.get_file("/a.txt")
+        assert isinstance(file, MemoryFile)
+
+        iterator = await file.get_view_iterator(chunk_size=5)
+
+        assert [bytes(view) async for view in iterator] == [b"Hello", b" worl", b"d!"]
+
+    @pytest.mark.anyio
+    async def test_metadata(self, memory_adapter: MemoryAdapter) -> None:
+        metadata = await memory_adapter.get_metadata("/a.txt")
+        await memory_adapter.write("/a.txt", b"Hello")
+
+        changed = await memory_adapter.get_metadata("/a.txt")
+
+        assert metadata.size == 12
+        assert metadata.content_type == "text/plain"
+        assert changed.size == 5
+        assert changed.etag != metadata.etag
+
+    @pytest.mark.anyio
+    async def test_write_iterator(self) -> None:
+        adapter = MemoryAdapter()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            yield b"Hello "
+            yield b"world!"
+
+        file = await adapter.write_iterator("/file", chunks())
+
+        assert await file.read() == b"Hello world!"
+        assert await file.size == 12
+
+    @pytest.mark.anyio
+    async def test_copy_and_move(self, memory_adapter: MemoryAdapter) -> None:
+        await memory_adapter.copy("/a.txt", "/copy.txt")
+        await memory_adapter.move("/copy.txt", "/moved.txt")
+
+        assert await memory_adapter.read("/moved.txt") == b"Hello world!"
+        with pytest.raises(NotFoundException):
+            await memory_adapter.read("/copy.txt")
+        with pytest.raises(NotFoundException):
+            await memory_adapter.move("/copy.txt", "/elsewhere.txt")
+
+    @pytest.mark.anyio
+    async def test_copy_to_local(
+        self, memory_adapter: MemoryAdapter, tmp_path_factory: pytest.TempPathFactory
+    ) -> None:
+        directory = tmp_path_factory.mktemp("memory")
+
+        file = await Filesystem(memory_adapter).copy(
+            "/a.txt", f"{directory}/a.txt", Filesystem(LocalAdapter())
+        )
+
+        assert await file.read() == b"Hello world!"
+
+    @pytest.mark.anyio
+    async def test_delete(self, memory_adapter: MemoryAdapter) -> None:
+        results = await memory_adapter.delete_many(["/a.txt", "/missing"], 16)
+
+        assert results[0] is None
+        assert isinstance(results[1], NotFoundException)
+        assert memory_adapter.size == 48
+        with pytest.raises(NotFoundException):
+            await memory_adapter.delete("/a.txt")
+
+    @pytest.mark.anyio
+    async def test_max_size(self) -> None:
+        adapter = MemoryAdapter(max_size=20)
+        await adapter.write("/first", b"Hello world!")
+        await adapter.write("/first", b"Hello world, again!")
+
+        with pytest.raises(CapacityExceededException):
+            await adapter.write("/second", b"Hello")
+
+        await adapter.delete("/first")
+        file: File = await adapter.write("/second", b"Hello")
+
+        assert await file.read() == b"Hello"
+        assert adapter.size == 5
+
+    @pytest.mark.anyio
+    async def test_max_size_write_iterator(self) -> None:
+        adapter = MemoryAdapter(max_size=8)
+        consumed = []
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in [b"Hello ", b"world", b"!"]:
+                consumed.append(chunk)
+                yield chunk
+
+        with pytest.raises(CapacityExceededException):
+            await adapter.write_iterator("/file", chunks())
+
+        assert consumed == [b"Hello ", b"world"]
+        assert adapter.size == 0
@@ -0,0 +1,183 @@
+import asyncio
+from collections.abc import Mapping
+
+import pytest
+from azure.core.exceptions import HttpResponseError
+
+from plugfs.filesystem import File, FileMetadata, NotFoundException
+from plugfs.local import LocalAdapter
+from plugfs.retry import RetryingAdapter, RetryPolicy
+from plugfs.wrapper import WrappingAdapter
+
+
+class _Response:
+    status_code: int
+    reason: str
+    headers: Mapping[str, str]
+    request: None = None
+
+    def __init__(self, status_code: int, headers: Mapping[str, str]) -> None:
+        self.status_code = status_code
+        self.reason = "Injected"
+        self.headers = headers
+
+    def text(self, encoding: str | None = None) -> str:
+        return ""
+
+
+class FaultInjectingAdapter(WrappingAdapter):
+    """Fails the first failures calls with the status, and delays the calls listed in
+    latencies by their latency."""
+
+    failures: int
+    status: int
+    headers: Mapping[str, str]
+    latencies: list[float]
+    calls: int
+
+    def __init__(
+        self,
+        failures: int = 0,
+        status: int = 503,
+        headers: Mapping[str, str] | None = None,
+        latencies: list[float] | None = None,
+    ) -> None:
+        super().__init__(LocalAdapter())
+        self.failures = failures
+        self.status = status
+        self.headers = {} if headers is None else headers
+        self.latencies = [] if latencies is None else latencies
+        self.calls = 0
+
+    async def _inject(self) -> None:
+        self.calls += 1
+        if self.latencies:
+            await asyncio.sleep(self.latencies.pop(0))
+
+        if self.failures > 0:
+            self.failures -= 1
+            raise HttpResponseError(response=_Response(self.status, self.headers))
+
+    async def read(self, path: str) -> bytes:
+        await self._inject()
+        return await super().read(path)
+
+    async def get_file(self, path: str) -> File:
+        await self._inject()
+        return await super().get_file(path)
+
+    async def get_metadata(self, path: str) -> FileMetadata:
+        await self._inject()
+        return await super().get_metadata(path)
+
+    async def write(self, path: str, data: bytes) -> File:
+        await self._inject()
+        return await super().write(path, data)
+
+
+FAST = RetryPolicy(base_delay=0.001, max_delay=0.1)
+
+
+class TestRetryPolicy:
+    def test_not_retryable(self) -> None:
+        assert FAST.delay(NotFoundException(), 1) is None
+        assert FAST.delay(HttpResponseError(response=_Response(400, {})), 1) is None
+
+    def test_backoff(self) -> None:
+        error = ConnectionResetError()
+
+        for attempt in [1, 2, 3]:
+            delay = FAST.delay(error, attempt)
+            assert delay is not None
+            assert 0 <= delay <= 0.001 * 2 ** (attempt - 1)
+
+        assert FAST.delay(error, 4) is None
+
+    def test_retry_after(self) -> None:
+        for headers in [{"Retry-After": "0.05"}, {"x-ms-retry-after-ms": "50"}]:
+            error = HttpResponseError(response=_Response(429, headers))
+            delay = FAST.delay(error, 1)
+            assert delay is not None
+            assert delay >= 0.05
+
+    def test_retry_after_longer_than_max_delay(self) -> None:
+        error = HttpResponseError(response=_Response(503, {"Retry-After": "120"}))
+
+        assert FAST.delay(error, 1) is None
+
+
+class TestRetryingAdapter:
+    @pytest.mark.anyio
+    async def test_retries_throttled(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter(failures=2, status=429)
+        adapter = RetryingAdapter(faulty, FAST)
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+        assert faulty.calls == 3
+        assert adapter.statistics.retries == 2
+
+    @pytest.mark.anyio
+    async def test_gives_up(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter(failures=10, status=503)
+        adapter = RetryingAdapter(faulty, FAST)
+
+        with pytest.raises(HttpResponseError):
+            await adapter.write(f"{directory}/written", b"Hello world!")
+
+        assert faulty.calls == 4
+
+    @pytest.mark.anyio
+    async def test_honours_retry_after(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter(
+            failures=1, status=503, headers={"Retry-After": "0.05"}
+        )
+        adapter = RetryingAdapter(faulty, FAST)
+
+        start = asyncio.get_running_loop().time()
+        await adapter.get_metadata(f"{directory}/file")
+
+        assert asyncio.get_running_loop().time() - start >= 0.05
+
+    @pytest.mark.anyio
+    async def test_not_found_is_not_retried(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter()
+        adapter = RetryingAdapter(faulty, FAST)
+
+        with pytest.raises(NotFoundException):
+            await adapter.read(f"{directory}/missing")
+
+        assert faulty.calls == 1
+
+    @pytest.mark.anyio
+    async def test_hedged_read(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter(latencies=[1.0, 0.0])
+        adapter = RetryingAdapter(faulty, FAST, hedge_after=0.01)
+
+        start = asyncio.get_running_loop().time()
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+
+        assert asyncio.get_running_loop().time() - start < 0.5
+        assert faulty.calls == 2
+        assert adapter.statistics.hedges == 1
+        assert adapter.statistics.hedge_wins == 1
+
+    @pytest.mark.anyio
+    async def test_hedge_not_needed(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter()
+        adapter = RetryingAdapter(faulty, FAST, hedge_after=0.5)
+
+        file = await adapter.get_file(f"{directory}/file")
+
+        assert await file.size == 12
+        assert faulty.calls == 1
+        assert adapter.statistics.hedges == 0
+
+    @pytest.mark.anyio
+    async def test_hedged_request_fails(self, directory: str) -> None:
+        faulty = FaultInjectingAdapter(latencies=[0.05, 0.0], failures=1)
+        adapter = RetryingAdapter(faulty, FAST, hedge_after=0.01)
+
+        assert await adapter.read(f"{directory}/file") == b"Hello world!"
+        assert adapter.statistics.hedges == 1
+        assert adapter.statistics.hedge_wins == 0
+        assert adapter.statistics.retries == 0
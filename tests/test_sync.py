@@ -0,0 +1,114 @@
+import os
+import shutil
+from os import path
+from typing import AsyncGenerator
+from uuid import uuid4
+
+import pytest
+
+from plugfs.filesystem import Filesystem
+from plugfs.local import LocalAdapter
+from plugfs.memory import MemoryAdapter
+from plugfs.sync import sync
+
+
+@pytest.fixture
+async def directories() -> AsyncGenerator[tuple[str, str], None]:
+    source = path.join("/tmp", str(uuid4()))
+    destination = path.join("/tmp", str(uuid4()))
+    os.makedirs(path.join(source, "nested"))
+
+    with open(path.join(source, "file.txt"), "wb") as file:
+        file.write(b"Hello world!")
+    with open(path.join(source, "nested", "file.txt"), "wb") as file:
+        file.write(b"Hello nested world!")
+
+    yield source, destination
+
+    shutil.rmtree(source)
+    shutil.rmtree(destination, ignore_errors=True)
+
+
+class TestSync:
+    @pytest.mark.anyio
+    async def test_sync(self, directories: tuple[str, str]) -> None:
+        source, destination = directories
+        filesystem = Filesystem(LocalAdapter())
+
+        result = await sync(filesystem, source, Filesystem(LocalAdapter()), destination)
+
+        assert result.copied == ["file.txt", "nested/file.txt"]
+        assert result.unchanged == []
+        with open(path.join(destination, "nested", "file.txt"), "rb") as file:
+            assert file.read() == b"Hello nested world!"
+
+    @pytest.mark.anyio
+    async def test_sync_to_root(self, directories: tuple[str, str]) -> None:
+        source, _ = directories
+        memory = MemoryAdapter()
+        destination = Filesystem(memory)
+
+        result = await sync(Filesystem(LocalAdapter()), source, destination, "")
+
+        assert result.copied == ["file.txt", "nested/file.txt"]
+        assert [item.path for item in await destination.list("")] == [
+            "file.txt",
+            "nested",
+        ]
+        assert await memory.read("nested/file.txt") == b"Hello nested world!"
+
+    @pytest.mark.anyio
+    async def test_sync_only_changed(self, directories: tuple[str, str]) -> None:
+        source, destination = directories
+        filesystem = Filesystem(LocalAdapter())
+        await sync(filesystem, source, filesystem, destination)
+
+        with open(path.join(source, "nested", "file.txt"), "wb") as file:
+            file.write(b"Hello changed world!")
+
+        result = await sync(filesystem, source, filesystem, destination)
+
+        assert result.copied == ["nested/file.txt"]
+        assert result.unchanged == ["file.txt"]
+        with open(path.join(destination, "nested", "file.txt"), "rb") as file:
+            assert file.read() == b"Hello changed world!"
+
+    @pytest.mark.anyio
+    async def test_sync_checksum(self, directories: tuple[str, str]) -> None:
+        source, destination = directories
+        filesystem = Filesystem(LocalAdapter())
+        await sync(filesystem, source, filesystem, destination)
+
+        # Same size, only the contents tell the files apart.
+        with open(path.join(destination, "file.txt"), "wb") as file:
+            file.write(b"Hello World!")
+
+        assert (await sync(filesystem, source, filesystem, destination)).copied == []
+
+        result = await sync(
+            filesystem, source, filesystem, destination, comparison="checksum"
+        )
+
+        assert result.copied == ["file.txt"]
+
+    @pytest.mark.anyio
+    async def test_sync_delete(self, directories: tuple[str, str]) -> None:
+        source, destination = directories
+        filesystem = Filesystem(LocalAdapter())
+        await sync(filesystem, source, filesystem, destination)
+        os.remove(path.join(source, "file.txt"))
+
+        result = await sync(filesystem, source, filesystem, destination, delete=True)
+
+        assert result.deleted == ["file.txt"]
+        assert not path.exists(path.join(destination, "file.txt"))
+
+    @pytest.mark.anyio
+    async def test_sync_dry_run(self, directories: tuple[str, str]) -> None:
+        source, destination = directories
+        filesystem = Filesystem(LocalAdapter())
+
+        result = await sync(filesystem, source, filesystem, destination, dry_run=True)
+
+        assert result.copied == ["file.txt", "nested/file.txt"]
+        assert not path.exists(destination)